@@ -1,7 +1,19 @@
+import os
+import sys
+
 from fastapi import FastAPI
 
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.instrument import instrument  # noqa: E402
+
 app = FastAPI()
 
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema, wired the same way in every lesson (shared/instrument.py)
+profiler = instrument(app, __file__)
+
 
 # ---------------------------
 # HTTP Methods Endpoints
@@ -1,8 +1,47 @@
-from fastapi import FastAPI
+import os
+import sys
+
+from fastapi import FastAPI, Query
 from enum import Enum
 
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.instrument import instrument  # noqa: E402
+from shared.users import UserStore  # noqa: E402
+
 app = FastAPI()
 
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema, wired the same way in every lesson (shared/instrument.py)
+profiler = instrument(app, __file__)
+
+
+# ---------------------------
+# Enum for the user roles
+# ---------------------------
+class UserRole(str, Enum):
+    admin = "admin"
+    editor = "editor"
+    viewer = "viewer"
+
+
+# ---------------------------
+# Users Database
+# ---------------------------
+# - by id   → dict lookup
+# - by role → one bitmap per role (1 bit per user id): "is user X an admin"
+#             is a single bit test, and roles can be combined with and / or /
+#             not without scanning the users
+users = UserStore(roles=[role.value for role in UserRole], users=[
+    {"id": 1, "username": "root", "roles": ["admin", "editor", "viewer"]},
+    {"id": 2, "username": "alice", "roles": ["editor", "viewer"]},
+    {"id": 3, "username": "bob", "roles": ["viewer"]},
+    {"id": 4, "username": "carol", "roles": ["admin", "viewer"]},
+    {"id": 5, "username": "dave", "roles": ["editor"]},
+    {"id": 6, "username": "erin", "roles": ["viewer"]},
+])
+
 
 # ---------------------------
 # Simple GET endpoint
@@ -23,30 +62,59 @@ async def admin_user():
     return {"message ": "this is the admin portal"}
 
 
+# ---------------------------
+# Combine roles (static, so it must come before /users/{user_id})
+# ---------------------------
+@app.get("/users/roles")
+async def get_users_by_roles(
+    all_of: list[UserRole] = Query([]),
+    any_of: list[UserRole] = Query([]),
+    none_of: list[UserRole] = Query([]),
+    after: int = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Users matching a role expression, e.g.
+    - ?all_of=admin&all_of=editor   → admins who are also editors (and)
+    - ?any_of=admin&any_of=editor   → admins or editors (or)
+    - ?any_of=editor&none_of=admin  → editors who are not admins (and not)
+    Pages by id: pass `next_after` back as `after`.
+    """
+    if not all_of and not any_of:
+        return {"error": "Give at least one role in all_of or any_of"}
+    ids = users.select([r.value for r in all_of], [r.value for r in any_of], [r.value for r in none_of])
+    page, next_after = users.page(ids, after, limit)
+    return {"count": len(ids), "users": page, "next_after": next_after}
+
+
 # ---------------------------
 # Dynamic path parameter
 # ---------------------------
 @app.get("/users/{user_id}")
 async def get_user(user_id: int):
-    # user_id is captured from the path as an integer
-    return {"message": f"User with ID {user_id}"}
+    # user_id is captured from the path as an integer (O(1) dict lookup)
+    user = users.get(user_id)
+    return user if user else {"message": f"User with ID {user_id} not found"}
 
 
 # ---------------------------
 # Enum usage for path parameter
 # ---------------------------
-class UserRole(str, Enum):
-    admin = "admin"
-    editor = "editor"
-    viewer = "viewer"
+@app.get("/users/role/{role}")
+async def get_users_with_role(role: UserRole, after: int = None, limit: int = Query(100, ge=1, le=1000)):
+    # Walks the role's bitmap in id order, from `after` on
+    page, next_after = users.page(users.select(all_of=[role.value]), after, limit)
+    return {"role": role, "count": users.count(role.value), "users": page, "next_after": next_after}
 
 
 @app.get("/users/role/{role}/{user_id}")
 async def get_user_by_role(role: UserRole, user_id: int):
     # user_type must be one of the enum values (admin, editor, viewer)
     # user_id can be any valid integer
-    # Returns a dict with user type and id
-    return {"message": f"User with ID {user_id} has role {role}"}
+    # "Has this user this role?" is a single bit test in the role's bitmap
+    if not users.has_role(user_id, role.value):
+        return {"message": f"User with ID {user_id} does not have role {role.value}"}
+    return {"message": f"User with ID {user_id} has role {role.value}", "user": users.get(user_id)}
 
 
 """
@@ -55,4 +123,6 @@ Summary Notes:
 1) Static routes should come BEFORE dynamic routes to avoid conflicts.
 2) include_in_schema=False hides endpoints from automatic docs to be secure.
 3) Enum classes are useful to restrict path parameter values.
+4) One bitmap per role keeps role checks O(1) and role listings cheap,
+   even with millions of users (10 million users → 1.25MB per role).
 """
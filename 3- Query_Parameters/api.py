@@ -1,6 +1,33 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import Literal
 
-app = FastAPI()
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.admission import AdmissionControl, AdmissionMiddleware, Limit  # noqa: E402
+from shared.cache import ConditionalGetMiddleware, ResponseCache  # noqa: E402
+from shared.changefeed import CREATE, STOCK, UPDATE, ChangeFeed  # noqa: E402
+from shared.compression import AdaptiveGzip, GzipMiddleware  # noqa: E402
+from shared.instrument import instrument  # noqa: E402
+from shared.singleflight import SingleFlight  # noqa: E402
+from shared.store import decode_cursor, encode_cursor, open_store  # noqa: E402
+from shared.streaming import ndjson_response, stream_requested  # noqa: E402
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: release the catalog's resources (e.g. pooled SQLite connections)
+    await store.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 # ---------------------------
@@ -13,76 +40,338 @@ async def read_root():
 
 
 # ---------------------------
-# In-Memory Items Database
+# Items Database
 # ---------------------------
 items = [
-    {"id": 1, "name": "book", "price": "15", "stock": True},
-    {"id": 2, "name": "game", "price": "50", "stock": True},
-    {"id": 3, "name": "cd", "price": "30", "stock": True},
-    {"id": 4, "name": "magazine", "price": "10", "stock": False},
-    {"id": 5, "name": "book", "price": "10", "stock": True},
-    {"id": 6, "name": "game", "price": "10", "stock": True},
+    {"id": 1, "name": "book", "price": 15, "stock": True},
+    {"id": 2, "name": "game", "price": 50, "stock": True},
+    {"id": 3, "name": "cd", "price": 30, "stock": True},
+    {"id": 4, "name": "magazine", "price": 10, "stock": False},
+    {"id": 5, "name": "book", "price": 10, "stock": True},
+    {"id": 6, "name": "game", "price": 10, "stock": True},
 ]
 
+# Storage engine (set with the CATALOG_ENGINE environment variable):
+# - "memory"   → dict by id, multi-map by name, sorted price index (default)
+# - "columnar" → NumPy arrays + vectorized filters (needs `pip install numpy`)
+# - "sqlite"   → SQLite file in WAL mode (CATALOG_DB), survives restarts and
+#                is shared by all workers; `items` only seeds an empty database
+# - "shm"      → one shared memory segment (CATALOG_SHM) mapped by every worker:
+#                a single copy in RAM, writes visible to all workers at once
+CATALOG_ENGINE = os.getenv("CATALOG_ENGINE", "memory")
+CATALOG_DB = os.getenv("CATALOG_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.db"))
+CATALOG_SHM = os.getenv("CATALOG_SHM", "learning_fastapi_catalog")
+
+# Every engine has the same async methods: `await store.get(...)`
+store = open_store(items, CATALOG_ENGINE, CATALOG_DB, shm_name=CATALOG_SHM)
+
+# Writes made through this app are pushed to /items/changes subscribers.
+# The feed lives in the process: with several workers, a client only sees
+# the writes handled by the worker it is connected to.
+changes = ChangeFeed(history=1000, buffer_size=256)
+
+
+# ---------------------------
+# Admission Control (429 / 503 + Retry-After)
+# ---------------------------
+# Under overload, excess requests are rejected right away instead of waiting
+# in the event loop and slowing down everyone else:
+# - token bucket per client + route (requests/sec, burst)
+# - at most `max_concurrency` requests in flight for the whole app
+# Added before the cache, so cache hits (cheap) are never rejected.
+admission = AdmissionControl(
+    limits={
+        "GET /items": Limit(rate=500, burst=1000),
+        "GET /items/search": Limit(rate=500, burst=1000),
+        "GET /items/prices": Limit(rate=200, burst=400),
+        "GET /items/stock": Limit(rate=200, burst=400),
+        "GET /items/changes": Limit(rate=5, burst=20),  # reconnect storms
+    },
+    max_concurrency=64
+)
+# Event streams stay open: rate limited, but they don't take concurrency slots
+app.add_middleware(AdmissionMiddleware, control=admission, routes=app.routes, long_lived={"/items/changes"})
+
+
+# ---------------------------
+# Response Cache (ETag + If-None-Match)
+# ---------------------------
+# Read-only listings are cached until the catalog version changes.
+# Clients sending back the ETag get a 304 with no body.
+# Identical requests that miss the cache at the same time (a burst right
+# after a write) are coalesced: the first one sorts / filters / encodes,
+# the others await its response (COALESCE_REQUESTS=0 turns this off).
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "1") != "0"
+
+response_cache = ResponseCache(maxsize=256)
+flights = SingleFlight() if COALESCE_REQUESTS else None
+app.add_middleware(
+    ConditionalGetMiddleware,
+    cache=response_cache,
+    version=lambda: store.version,
+    paths={"/items", "/items/search", "/items/prices", "/items/stock"},
+    flights=flights
+)
+
+# ---------------------------
+# Gzip Compression (Accept-Encoding)
+# ---------------------------
+# Responses of at least GZIP_MIN_SIZE bytes are gzipped for clients that
+# accept it; the level adapts to the body size and to how busy the CPU is.
+# Streamed listings are compressed chunk by chunk.
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+
+compression = AdaptiveGzip(minimum_size=GZIP_MIN_SIZE)
+app.add_middleware(GzipMiddleware, gzip=compression)
+
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema (shared/instrument.py). Added last, so they wrap the
+# middlewares above and see rejected requests and cache hits too.
+profiler = instrument(app, __file__)
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    # Hit / miss / 304 counters of the response cache, and coalesced requests
+    return {**response_cache.stats(), "coalescing": flights.stats() if flights else None}
+
+
+@app.get("/admission/stats")
+async def get_admission_stats():
+    # Admitted / rejected counters of the admission control
+    return admission.stats()
+
+
+@app.get("/compression/stats")
+async def get_compression_stats():
+    # Bytes before / after gzip, and the levels used
+    return compression.stats()
+
+
+@app.get("/changes/stats")
+async def get_changes_stats():
+    # Subscribers connected / dropped, and events published
+    return changes.stats()
+
 
 # ---------------------------
 # Items with Filters + Pagination
 # ---------------------------
+MAX_PAGE_SIZE = 100  # largest `limit` of a cursor page
+
+
 @app.get("/items")
 async def get_items(
     start: int = 0,
     end: int = 10,
     id: int = None,
-    name: str = None
+    name: str = None,
+    cursor: str = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    streaming: bool = Depends(stream_requested)
 ):
     # Filter: item by ID
     if id:
-        item = next((item for item in items if item["id"] == id), None)
+        item = await store.get(id)  # O(1) hash / primary-key lookup instead of a full scan
         return item if item else {"message": "Item not found"}
 
     # Filter: items by name
     if name:
-        filtered_items = [item for item in items if item["name"] == name]
-        return filtered_items
+        if streaming:
+            return ndjson_response(store.iter_by_name(name))
+        return await store.find_by_name(name)
+
+    # Keyset pagination: "give me `limit` items after this cursor".
+    # Every page costs the same, and inserts never shift the next page.
+    if cursor or limit:
+        try:
+            after_id = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return {"error": "Invalid cursor value. Use the next_cursor from a previous page."}
+
+        # Without `limit`, `end` is the page size (as for offset pages)
+        size = limit or end
+        if not 1 <= size <= MAX_PAGE_SIZE:
+            return {"error": f"Page size must be between 1 and {MAX_PAGE_SIZE}."}
+
+        page, last_id = await store.page_after(after_id, size)
+        return {
+            "items": page,
+            "next_cursor": encode_cursor(last_id) if last_id is not None else None
+        }
 
-    # Pagination results
-    return items[start:start + end]
+    # Pagination results (offset based, kept for backwards compatibility)
+    if streaming:
+        return ndjson_response(store.iter_page(start, end))
+    return await store.page(start, end)
 
 
 # ---------------------------
-# Sort Items by Price + Optional Range Filtering
+# Typeahead Search by Name
 # ---------------------------
-@app.get("/items/prices")
-async def get_items_by_price(max_range: str = None):
-    # Sort items by price (descending)
-    sorted_items = sorted(items, key=lambda x: int(x["price"]), reverse=True)
+@app.get("/items/search")
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=48),
+    mode: Literal["prefix", "substring"] = "prefix",
+    limit: int = Query(10, ge=1, le=100)
+):
+    """
+    - mode=prefix    → names starting with `q`   ("gam" → game, games)
+    - mode=substring → names containing `q`, prefix matches first
+    Case-insensitive. Answered from a name index kept up to date on every
+    write, so a keystroke never scans the whole catalog.
+    """
+    return await store.search(q, substring=mode == "substring", limit=limit)
 
-    # Optional: filter by maximum price
-    if max_range:
-        try:
-            max_price = int(max_range)
-        except ValueError:
-            return {"error": "Invalid max_range value. Please provide a numeric value."}
-        filtered_items = [item for item in sorted_items if int(
-            item["price"]) <= max_price]
-        return filtered_items
 
-    return sorted_items
+# ---------------------------
+# Sort Items by Price + Optional Range Filtering
+# ---------------------------
+@app.get("/items/prices")
+async def get_items_by_price(
+    min_range: float = None,
+    max_range: float = None,
+    streaming: bool = Depends(stream_requested)
+):
+    # Items come out of the price index already sorted (descending),
+    # so a price range is just a binary-search slice: O(log n + k).
+    # Streamed, the rows are built while they are sent, not all up front.
+    if streaming:
+        return ndjson_response(store.iter_by_price(min_price=min_range, max_price=max_range))
+    return await store.by_price(min_price=min_range, max_price=max_range)
 
 
 # ---------------------------
 # Filter Items by Stock Availability
 # ---------------------------
 @app.get("/items/stock")
-async def get_items_by_stock(in_stock: bool = True):
+async def get_items_by_stock(
+    in_stock: bool = True,
+    streaming: bool = Depends(stream_requested)
+):
     """
     - in_stock=True  → return only items in stock
     - in_stock=False → return only out-of-stock items
     """
+    if streaming:
+        return ndjson_response(store.iter_in_stock(in_stock))
+    return await store.in_stock(in_stock)
+
+
+# ---------------------------
+# Update an Item (query parameters)
+# ---------------------------
+# The shared-memory engine stores names in 48 bytes: the same limit for
+# every engine keeps a catalog movable between them
+NAME_MAX_LENGTH = 48
+
+
+async def write_item(write):
+    # A value the store can't hold (e.g. a name over 48 bytes of UTF-8) is the client's error
+    try:
+        return await write
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+
+
+@app.patch("/items/{item_id}")
+async def update_item(
+    item_id: int,
+    name: str = Query(None, min_length=1, max_length=NAME_MAX_LENGTH),
+    price: float = None,
+    stock: bool = None
+):
+    # Only the query parameters that were sent are changed
+    updates = {key: value for key, value in (("name", name), ("price", price), ("stock", stock)) if value is not None}
+    item = await store.get(item_id)
+    if item is None:
+        return {"message": "Item not found"}
+    was_in_stock = item["stock"]
+    item = await write_item(store.update(item_id, **updates))
+    # A stock flip gets its own event type, so clients can watch just those
+    changes.publish(STOCK if item["stock"] != was_in_stock else UPDATE, item)
+    return item
 
-    if in_stock:
-        stock_items = [item for item in items if item["stock"]]
-        return stock_items
 
-    out_of_stock_items = [item for item in items if not item["stock"]]
-    return out_of_stock_items
+# ---------------------------
+# Create an Item (query parameters)
+# ---------------------------
+@app.post("/items")
+async def create_item(
+    name: str = Query(..., min_length=1, max_length=NAME_MAX_LENGTH),
+    price: float = Query(...),
+    stock: bool = True
+):
+    # The store picks the next free id
+    item = await write_item(store.insert({"name": name, "price": price, "stock": stock}))
+    changes.publish(CREATE, item)
+    return item
+
+
+# ---------------------------
+# Live Changes (Server-Sent Events / WebSocket)
+# ---------------------------
+"""
+Instead of polling /items, clients subscribe once and get every create /
+update / stock change as it happens:
+    - GET /items/changes        → text/event-stream (EventSource in browsers)
+    - WS  /items/changes/ws     → one JSON message per change
+Every event has a sequence number. To resume after a disconnect, pass the
+last one seen as `?after=` (EventSource sends it as `Last-Event-ID` by
+itself); a "reset" event means too much was missed: reload the listing.
+A client that can't keep up gets a "dropped" event and is disconnected.
+"""
+HEARTBEAT_SECONDS = 15  # keeps proxies from closing an idle stream
+
+
+def sse_message(event) -> str:
+    return f"id: {event.seq}\nevent: {event.type}\ndata: {event.data}\n\n"
+
+
+@app.get("/items/changes")
+async def stream_item_changes(after: int = None, last_event_id: int | None = Header(None)):
+    subscription = changes.subscribe(after if after is not None else last_event_id)
+
+    async def events():
+        try:
+            events = aiter(subscription)
+            while True:
+                try:
+                    event = await asyncio.wait_for(anext(events), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"  # comment line, ignored by EventSource
+                    continue
+                except StopAsyncIteration:
+                    return
+                yield sse_message(event)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.websocket("/items/changes/ws")
+async def item_changes_websocket(websocket: WebSocket, after: int = None):
+    await websocket.accept()
+    subscription = changes.subscribe(after)
+    try:
+        async for event in subscription:
+            await websocket.send_text(event.data)
+        # Only a dropped subscription ends: 1013 = "try again later"
+        await websocket.close(code=1013)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+
+# ---------------------------
+# Streaming Large Listings (NDJSON)
+# ---------------------------
+"""
+Listing endpoints accept `?stream=true` or `Accept: application/x-ndjson`.
+Instead of one big JSON array, the response is sent as one JSON object per
+line, chunk by chunk (StreamingResponse):
+    - memory stays bounded (the whole body is never built at once)
+    - the client receives the first items right away
+"""
@@ -1,8 +1,36 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Optional
+import os
+import sys
+from contextlib import asynccontextmanager
 
-app = FastAPI()
+from fastapi import Body, FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, Optional
+
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.instrument import instrument  # noqa: E402
+from shared.store import open_store  # noqa: E402
+from shared.write_behind import WriteBehindQueue, WriteTicket, enqueue  # noqa: E402
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: the worker that writes queued mutations to the store
+    await writes.start()
+    yield
+    # Shutdown: apply every accepted write first, then release the catalog's
+    # resources (e.g. pooled SQLite connections)
+    await writes.close()
+    await store.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema, wired the same way in every lesson (shared/instrument.py)
+profiler = instrument(app, __file__)
 
 
 # ---------------------------
@@ -15,17 +43,26 @@ async def read_root():
 
 
 # ---------------------------
-# In-Memory Items Database
+# Items Database
 # ---------------------------
 items = [
-    {"id": 1, "name": "book", "price": "15", "stock": True},
-    {"id": 2, "name": "game", "price": "50", "stock": True},
-    {"id": 3, "name": "cd", "price": "30", "stock": True},
-    {"id": 4, "name": "magazine", "price": "10", "stock": False},
-    {"id": 5, "name": "book", "price": "10", "stock": True},
-    {"id": 6, "name": "games", "price": "10", "stock": True},
+    {"id": 1, "name": "book", "price": 15, "stock": True},
+    {"id": 2, "name": "game", "price": 50, "stock": True},
+    {"id": 3, "name": "cd", "price": 30, "stock": True},
+    {"id": 4, "name": "magazine", "price": 10, "stock": False},
+    {"id": 5, "name": "book", "price": 10, "stock": True},
+    {"id": 6, "name": "games", "price": 10, "stock": True},
 ]
 
+# Storage engine (set with the CATALOG_ENGINE environment variable):
+# - "memory" → in-memory indexed store, lost on restart (default)
+# - "sqlite" → SQLite file in WAL mode (CATALOG_DB), survives restarts and
+#              is shared by all workers; `items` only seeds an empty database
+CATALOG_ENGINE = os.getenv("CATALOG_ENGINE", "memory")
+CATALOG_DB = os.getenv("CATALOG_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.db"))
+
+store = open_store(items, CATALOG_ENGINE, CATALOG_DB)
+
 
 # ---------------------------
 # Pydantic Model for Items
@@ -38,31 +75,184 @@ class Item(BaseModel):
     tax: Optional[float] = None
 
 
+# ---------------------------
+# Response Models
+# ---------------------------
+# - The results of finished writes (GET /writes/{ticket}): POST and PUT
+#   only return a WriteTicket. Built with model_construct from values
+#   that were validated already, then dumped to a dict.
+class CreatedItem(Item):
+    id: int
+    total_price: Optional[float] = None
+
+
+class UpdatedItem(Item):
+    item_id: int
+
+
+# ---------------------------
+# Write-Behind Queue
+# ---------------------------
+# POST / PUT only validate the item and queue the write, then answer
+# 202 + a ticket right away. A background worker saves queued writes in
+# batches (one transaction per run of creates with SQLite).
+# GET /writes/{ticket} tells when a write is done, and returns its result.
+async def apply_writes(batch: list[tuple[str, int | None, Item]]) -> list[dict | Exception]:
+    # One entry per write, in batch order: its result, or the exception it
+    # raised. A failed write never marks the writes applied around it as failed.
+    results: list[dict | Exception | None] = [None] * len(batch)
+    creates = []  # (position, item): consecutive creates, saved with one insert_many
+
+    async def save_creates():
+        if not creates:
+            return
+        try:
+            saved = await store.insert_many([{**item.model_dump(), "stock": True} for _, item in creates])
+        except Exception as exc:
+            # All or nothing (one transaction): none of these creates was saved
+            for position, _ in creates:
+                results[position] = exc
+        else:
+            for (position, item), row in zip(creates, saved):
+                # Copy the validated fields into the response model (no re-validation)
+                created = CreatedItem.model_construct(id=row["id"], **item.model_dump())
+                # Include total price only if tax is provided
+                if item.tax:
+                    created.total_price = item.price + (item.price * item.tax)
+                # exclude_unset → "total_price" only appears when it was computed
+                results[position] = created.model_dump(exclude_unset=True)
+        creates.clear()
+
+    for position, (kind, item_id, item) in enumerate(batch):
+        if kind == "create":
+            creates.append((position, item))
+            continue
+        await save_creates()  # keep the writes in the order they were accepted
+
+        # PUT replaces the stored item (or creates it under this id)
+        fields = item.model_dump()
+        try:
+            try:
+                await store.update(item_id, **fields)
+            except KeyError:
+                await store.insert({"id": item_id, **fields, "stock": True})
+        except Exception as exc:
+            results[position] = exc
+            continue
+        results[position] = UpdatedItem.model_construct(item_id=item_id, **fields).model_dump()
+
+    await save_creates()
+    return results
+
+
+# At most 1000 pending writes; when full, requests wait up to 0.1s for room
+# (back-pressure), then get 503 + Retry-After
+writes = WriteBehindQueue(apply_writes, maxsize=1000, batch_size=100)
+
+
+@app.get("/writes")
+async def get_write_stats():
+    # Queue depth and accepted / applied / failed / rejected counters
+    return writes.stats()
+
+
+@app.get("/writes/{ticket}")
+async def get_write_status(ticket: str):
+    # queued → done (with the saved item) or failed (with the error)
+    status = writes.status(ticket)
+    return status if status else {"message": "Ticket not found"}
+
+
 # ---------------------------
 # Create Item (POST)
 # ---------------------------
-@app.post("/items")
-async def create_item(item: Item):
-    # Convert Pydantic model -> Python dict
-    item_dict = item.dict()
+@app.post("/items", response_model=WriteTicket, status_code=202)
+async def create_item(item: Item, request: Request):
+    # Validated already: queue the write, the store assigns the id later
+    # (the ticket's result is the CreatedItem, with id and total_price)
+    return await enqueue(writes, ("create", None, item), request)
 
-    # Include total price only if tax is provided
-    if item.tax:
-        total_price = item.price + (item.price * item.tax)
-        item_dict.update({"total_price": total_price})
 
-    return item_dict
+# ---------------------------
+# Bulk Create Items (POST)
+# ---------------------------
+# - Rows are taken as `Any`: with `list[dict]` a single non-object row
+#   would get the whole batch rejected with a 422 before the handler runs.
+#   openapi_extra puts the Item schema back on the rows in the docs.
+@app.post("/items/batch", openapi_extra={
+    "requestBody": {"content": {"application/json": {"schema": {
+        "items": {"$ref": "#/components/schemas/Item"}
+    }}}}
+})
+async def create_items_batch(
+    rows: list[Any] = Body(..., description="A list of Item objects")
+):
+    """
+    Creates many items in one request.\n
+    - Every row is validated on its own: invalid rows get their errors,
+      valid rows are still created (the batch is never rejected as a whole).
+    - Results come back in input order.
+    """
+    results = []
+    valid_items = []  # (result, item) for rows that passed validation
+
+    # Pass 1: validate every row
+    for row, data in enumerate(rows):
+        if not isinstance(data, dict):
+            results.append({
+                "row": row,
+                "errors": [{"type": "model_type", "loc": [], "msg": "Row must be an Item object", "input": data}]
+            })
+            continue
+        try:
+            item = Item.model_validate(data)
+        except ValidationError as exc:
+            results.append({
+                "row": row,
+                "errors": exc.errors(include_url=False, include_context=False)
+            })
+            continue
+        result = {"row": row, "item": item.model_dump()}
+        results.append(result)
+        valid_items.append((result, item))
+
+    # Pass 2: save all valid rows in one go (a single transaction with SQLite)
+    saved = await store.insert_many([{**result["item"], "stock": True} for result, _ in valid_items])
+    for (result, _), row in zip(valid_items, saved):
+        result["item"]["id"] = row["id"]
+
+    # Pass 3: total price of each taxed row (same rule as create_item).
+    # A plain loop, not vectorized: numpy is only needed by the columnar engine.
+    for result, item in valid_items:
+        if item.tax:
+            result["item"]["total_price"] = item.price + item.price * item.tax
+
+    # Plain dicts only → JSONResponse skips FastAPI's jsonable_encoder walk
+    return JSONResponse({
+        "created": len(valid_items),
+        "failed": len(results) - len(valid_items),
+        "results": results
+    })
+
+
+# ---------------------------
+# Read Item (GET)
+# ---------------------------
+@app.get("/items/{item_id}")
+async def read_item(item_id: int):
+    # Reads back an item from the store (memory or SQLite)
+    item = await store.get(item_id)
+    return item if item else {"message": "Item not found"}
 
 
 # ---------------------------
 # Update Item (PUT)
 # ---------------------------
-@app.put("/items/{item_id}")
-async def update_item(item_id: int, item: Item):
-    # Combine item_id with all item fields (dict unpacking)
-    # ** => unpacks the dict into key-value pairs
-    updated_item = {"item_id": item_id, **item.dict()}
-    return updated_item
+@app.put("/items/{item_id}", response_model=WriteTicket, status_code=202)
+async def update_item(item_id: int, item: Item, request: Request):
+    # Queue the write; the ticket's result is the UpdatedItem
+    # (item_id combined with all item fields)
+    return await enqueue(writes, ("update", item_id, item), request)
 
 
 # ---------------------------------------------------------
@@ -1,7 +1,22 @@
-from fastapi import FastAPI, Query
+import json
+import os
+import re
+import sys
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.instrument import instrument  # noqa: E402
 
 app = FastAPI()
 
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema, wired the same way in every lesson (shared/instrument.py)
+profiler = instrument(app, __file__)
+
 
 # -----------------------------------
 # Root Endpoint
@@ -20,6 +35,16 @@ async def read_items(name: str = "Unknown"):
     return {"name": name}
 
 
+# -----------------------------------
+# Validation Rules (shared by /validate and /validate/batch)
+# -----------------------------------
+NAME_MIN, NAME_MAX = 3, 50
+NAME_PATTERN = r"^[a-zA-Z]+$"
+
+EMAIL_MIN, EMAIL_MAX = 5, 100
+EMAIL_PATTERN = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+
+
 # -----------------------------------
 # Validation with Query(...)
 # -----------------------------------
@@ -27,16 +52,16 @@ async def read_items(name: str = "Unknown"):
 async def validate_item(
     name: str = Query(
         ...,
-        min_length=3,
-        max_length=50,
-        regex=r"^[a-zA-Z]+$",
+        min_length=NAME_MIN,
+        max_length=NAME_MAX,
+        regex=NAME_PATTERN,
         description="Name must contain only letters (3–50 chars)"
     ),
     email: str = Query(
         ...,
-        min_length=5,
-        max_length=100,
-        regex=r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$",
+        min_length=EMAIL_MIN,
+        max_length=EMAIL_MAX,
+        regex=EMAIL_PATTERN,
         description="Valid email format required"
     )
 ):
@@ -46,3 +71,95 @@ async def validate_item(
     - Email (must be a valid email format)
     """
     return {"Name": name, "Email": email}
+
+
+# -----------------------------------
+# Batch Validation (many name/email pairs in one request)
+# -----------------------------------
+# Patterns are compiled once, not per row / per request
+NAME_REGEX = re.compile(NAME_PATTERN)
+EMAIL_REGEX = re.compile(EMAIL_PATTERN)
+
+
+def check_field(value, min_length, max_length, regex) -> str | None:
+    # Same rules as Query(min_length=..., max_length=..., regex=...)
+    if not isinstance(value, str):
+        return "must be a string"
+    if len(value) < min_length:
+        return f"must have at least {min_length} characters"
+    if len(value) > max_length:
+        return f"must have at most {max_length} characters"
+    if not regex.fullmatch(value):
+        return "does not match the required pattern"
+    return None
+
+
+def check_pair(row: int, pair) -> dict:
+    if not isinstance(pair, dict):
+        return {"row": row, "valid": False, "errors": {"pair": "must be an object with name and email"}}
+
+    errors = {}
+    name_error = check_field(pair.get("name"), NAME_MIN, NAME_MAX, NAME_REGEX)
+    if name_error:
+        errors["name"] = name_error
+    email_error = check_field(pair.get("email"), EMAIL_MIN, EMAIL_MAX, EMAIL_REGEX)
+    if email_error:
+        errors["email"] = email_error
+
+    if errors:
+        return {"row": row, "valid": False, "errors": errors}
+    return {"row": row, "valid": True}
+
+
+async def read_ndjson(request: Request):
+    # Parse the body line by line while it is still arriving
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+@app.post("/validate/batch")
+async def validate_batch(request: Request):
+    """
+    Validates many name/email pairs with the same rules as /validate.\n
+    Body (either):
+    - JSON array: [{"name": "...", "email": "..."}, ...]
+    - NDJSON (Content-Type: application/x-ndjson): one pair per line
+
+    Returns one result per row (in input order); invalid rows do not
+    reject the batch.
+    """
+    results = []
+    if "application/x-ndjson" in request.headers.get("content-type", ""):
+        row = 0
+        async for line in read_ndjson(request):
+            try:
+                pair = json.loads(line)
+            except ValueError:
+                results.append({"row": row, "valid": False, "errors": {"pair": "invalid JSON"}})
+            else:
+                results.append(check_pair(row, pair))
+            row += 1
+    else:
+        try:
+            pairs = json.loads(await request.body())
+        except ValueError:
+            return {"error": "Body must be a JSON array of {name, email} objects."}
+        if not isinstance(pairs, list):
+            return {"error": "Body must be a JSON array of {name, email} objects."}
+        results = [check_pair(row, pair) for row, pair in enumerate(pairs)]
+
+    valid = sum(result["valid"] for result in results)
+    # Plain dicts only → JSONResponse skips FastAPI's jsonable_encoder walk
+    return JSONResponse({
+        "total": len(results),
+        "valid": valid,
+        "invalid": len(results) - valid,
+        "results": results
+    })
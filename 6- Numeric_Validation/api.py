@@ -1,6 +1,28 @@
+import os
+import sys
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Path, Query
 
-app = FastAPI()
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.instrument import instrument  # noqa: E402
+from shared.store import open_store  # noqa: E402
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: release the catalog's resources (e.g. pooled SQLite connections)
+    await store.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema, wired the same way in every lesson (shared/instrument.py)
+profiler = instrument(app, __file__)
 
 
 # -----------------------------------
@@ -12,6 +34,27 @@ async def read_root():
     return {"message": "Hello, World!"}
 
 
+# -----------------------------------
+# Items Database
+# -----------------------------------
+items = [
+    {"id": 1, "name": "book", "price": 15, "stock": True},
+    {"id": 2, "name": "game", "price": 50, "stock": True},
+    {"id": 3, "name": "cd", "price": 30, "stock": True},
+    {"id": 4, "name": "magazine", "price": 10, "stock": False},
+    {"id": 5, "name": "laptop", "price": 900, "stock": True},
+    {"id": 6, "name": "headphones", "price": 120, "stock": True},
+]
+
+# Storage engine (CATALOG_ENGINE: "memory" by default, or "sqlite" with
+# CATALOG_DB). Items are kept sorted by price, so a price range is found with
+# two binary searches instead of a scan over the whole catalog.
+CATALOG_ENGINE = os.getenv("CATALOG_ENGINE", "memory")
+CATALOG_DB = os.getenv("CATALOG_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.db"))
+
+store = open_store(items, CATALOG_ENGINE, CATALOG_DB)
+
+
 # -----------------------------------
 # Path Parameter Validation (item_id)
 # -----------------------------------
@@ -49,15 +92,32 @@ async def read_items(
         title="Maximum Price",
         description="The maximum price must be less than 1000.",
         lt=1000
-    )
+    ),
+    skip: int = Query(0, ge=0, description="Number of matching items to skip."),
+    limit: int = Query(10, ge=1, le=100, description="Page size (1–100)."),
+    count_only: bool = Query(False, description="Only return the number of matching items.")
 ):
     """
     Validates:
     - min_price > 0
     - max_price < 1000
+
+    Returns the items with min_price <= price <= max_price, most expensive
+    first, one page (skip / limit) at a time. The range comes from binary
+    searches over the price index, so the cost depends on the page size,
+    not on the catalog size; count_only=true skips the items entirely.
     """
+    total = await store.count_by_price(min_price, max_price)
+    if count_only:
+        return {"min_price": min_price, "max_price": max_price, "total": total}
+
+    page = await store.by_price(min_price, max_price, start=skip, limit=limit)
     return {
         "min_price": min_price,
-        "max_price": max_price
+        "max_price": max_price,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "items": page
     }
     
@@ -1,7 +1,31 @@
-from fastapi import FastAPI, Path, Query, Body
+import os
+import sys
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Path, Query, Body, Request
 from pydantic import BaseModel
 
-app = FastAPI()
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.instrument import instrument  # noqa: E402
+from shared.write_behind import WriteBehindQueue, WriteTicket, enqueue  # noqa: E402
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: the worker that saves queued updates
+    await writes.start()
+    yield
+    # Shutdown: apply every accepted update before exiting
+    await writes.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema, wired the same way in every lesson (shared/instrument.py)
+profiler = instrument(app, __file__)
 
 
 # -----------------------------------
@@ -29,10 +53,56 @@ class User(BaseModel):
     email: str | None = None
 
 
+# -----------------------------------
+# Item / User Records + Write-Behind Queue
+# -----------------------------------
+# (item_id, user_id) → the last saved update
+item_users: dict[tuple[int, int], dict] = {}
+
+
+async def apply_writes(batch: list[dict]) -> list[dict]:
+    # The worker saves queued updates in batches, in the order they were accepted
+    results = []
+    for update in batch:
+        record = {
+            **update,
+            "item": update["item"].model_dump() if update["item"] else None,
+            "user": update["user"].model_dump() if update["user"] else None,
+        }
+        item_users[update["item_id"], update["user_id"]] = record
+        results.append(record)
+    return results
+
+
+# At most 1000 pending updates; when full, requests wait up to 0.1s for room
+# (back-pressure), then get 503 + Retry-After
+writes = WriteBehindQueue(apply_writes, maxsize=1000, batch_size=100)
+
+
+@app.get("/writes")
+async def get_write_stats():
+    # Queue depth and accepted / applied / failed / rejected counters
+    return writes.stats()
+
+
+@app.get("/writes/{ticket}")
+async def get_write_status(ticket: str):
+    # queued → done (with the saved record) or failed (with the error)
+    status = writes.status(ticket)
+    return status if status else {"message": "Ticket not found"}
+
+
+@app.get("/items/{item_id}/users/{user_id}")
+async def read_item_user(item_id: int, user_id: int):
+    # The last applied update for this item / user pair
+    record = item_users.get((item_id, user_id))
+    return record if record else {"message": "Item not found"}
+
+
 # -----------------------------------
 # PUT Endpoint with Path + Body Validation
 # -----------------------------------
-@app.put("/items/{item_id}/users/{user_id}")
+@app.put("/items/{item_id}/users/{user_id}", response_model=WriteTicket, status_code=202)
 async def update_item_user(
     *,     # Forces keyword-only arguments (better clarity & avoids mixups)
 
@@ -52,6 +122,7 @@ async def update_item_user(
         le=5000
     ),
 
+    request: Request,
     item: Item | None = None,
     user: User | None = None,
     age: int = Body(
@@ -69,15 +140,17 @@ async def update_item_user(
     - Item model (name, desc, price)
     - User model (username, first/last name, email)
     - Age (1–149)
+
+    The update is then queued: 202 + a ticket to poll at /writes/{ticket}.
     """
 
-    return {
+    return await enqueue(writes, {
         "item_id": item_id,
         "user_id": user_id,
         "item": item,
         "user": user,
         "age": age
-    }
+    }, request)
 
 
 # ---------------------------------------------------------
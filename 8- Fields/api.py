@@ -1,8 +1,21 @@
+import os
+import sys
+
 from fastapi import FastAPI, Path, Body
 from pydantic import BaseModel, Field
 
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.instrument import instrument  # noqa: E402
+from shared.responses import PydanticJSONResponse  # noqa: E402
+
 app = FastAPI()
 
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema, wired the same way in every lesson (shared/instrument.py)
+profiler = instrument(app, __file__)
+
 
 # -----------------------------------
 # Root Endpoint
@@ -37,10 +50,18 @@ class Item(BaseModel):
     )
 
 
+# -----------------------------------
+# Response Model
+# -----------------------------------
+class ItemResponse(BaseModel):
+    item_id: int
+    item: Item
+
+
 # -----------------------------------
 # PUT Endpoint: Update Item
 # -----------------------------------
-@app.put("/items/{item_id}")
+@app.put("/items/{item_id}", response_model=ItemResponse)
 async def update_item(
     item_id: int = Path(
         ...,
@@ -62,10 +83,8 @@ async def update_item(
     - item (validated by the Item BaseModel)
     """
 
-    return {
-        "item_id": item_id,
-        "item": item
-    }
+    # Serialized straight to JSON bytes by pydantic-core (no jsonable_encoder)
+    return PydanticJSONResponse(ItemResponse(item_id=item_id, item=item))
 
 
 # ---------------------------------------------------------
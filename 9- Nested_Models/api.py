@@ -1,8 +1,49 @@
+import os
+import sys
+from typing import Annotated
+
 from fastapi import FastAPI, Path, Body
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field, WrapValidator, model_validator
+
+# Make the repo-level `shared` package importable (uvicorn runs from this folder)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.admission import AdmissionControl, AdmissionMiddleware, Limit  # noqa: E402
+from shared.compression import AdaptiveGzip, GzipMiddleware  # noqa: E402
+from shared.instrument import instrument  # noqa: E402
+from shared.responses import PydanticJSONResponse  # noqa: E402
+from shared.validation_cache import ValidationCache  # noqa: E402
 
 app = FastAPI()
 
+# Admission control: writes are expensive (nested validation), so they get a
+# strict per-client token bucket; anything over the limit, or over 32
+# requests in flight, is rejected at once with 429 / 503 + Retry-After.
+admission = AdmissionControl(
+    limits={
+        "PUT /products/{item_id}": Limit(rate=5, burst=10),
+        "POST /products/{product_id}": Limit(rate=5, burst=10),
+    },
+    max_concurrency=32
+)
+app.add_middleware(AdmissionMiddleware, control=admission, routes=app.routes)
+
+# -----------------------------------
+# Gzip Compression (Accept-Encoding)
+# -----------------------------------
+# Responses of at least GZIP_MIN_SIZE bytes are gzipped for clients that
+# accept it; the level adapts to the body size and to how busy the CPU is.
+# Streamed listings are compressed chunk by chunk.
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+
+compression = AdaptiveGzip(minimum_size=GZIP_MIN_SIZE)
+app.add_middleware(GzipMiddleware, gzip=compression)
+
+# Metrics (/metrics), opt-in profiling (/profiles) and the precomputed
+# OpenAPI schema (shared/instrument.py). Added last, so they wrap the
+# middlewares above and see rejected requests and cache hits too.
+profiler = instrument(app, __file__)
+
 
 # -----------------------------------
 # Root Endpoint
@@ -13,16 +54,65 @@ async def read_root():
     return {"message": "Hello, World!"}
 
 
+# -----------------------------------
+# Validation Cache (opt-in)
+# -----------------------------------
+# The same image URLs show up in request after request. With
+# VALIDATION_CACHE_SIZE=<n> (n > 0), identical URLs / Image objects reuse an
+# already-validated instance instead of being parsed again (bounded LRU).
+# The wrap validators are only attached when the cache is on: with the
+# default (0), validation costs exactly what it costs without a cache.
+VALIDATION_CACHE_SIZE = int(os.getenv("VALIDATION_CACHE_SIZE", "0"))
+
+url_cache = ValidationCache(maxsize=VALIDATION_CACHE_SIZE)
+image_cache = ValidationCache(maxsize=VALIDATION_CACHE_SIZE)
+
+# HttpUrl that goes through the URL cache first (a plain HttpUrl when it is off)
+if VALIDATION_CACHE_SIZE > 0:
+    CachedHttpUrl = Annotated[HttpUrl, WrapValidator(url_cache.wrap)]
+else:
+    CachedHttpUrl = HttpUrl
+
+
+@app.get("/validation-cache/stats")
+async def get_validation_cache_stats():
+    # Hit rate of the URL and Image caches
+    return {"url": url_cache.stats(), "image": image_cache.stats()}
+
+
+@app.get("/admission/stats")
+async def get_admission_stats():
+    # Admitted / rejected counters of the admission control
+    return admission.stats()
+
+
+@app.get("/compression/stats")
+async def get_compression_stats():
+    # Bytes before / after gzip, and the levels used
+    return compression.stats()
+
+
 # -----------------------------------
 # Pydantic Models
 # -----------------------------------
 class Image(BaseModel):
-    url: HttpUrl = Field(..., description="Valid URL for the image")
+    # Frozen: with the validation cache on, one instance is shared by every
+    # request that sent the same image
+    model_config = ConfigDict(frozen=True)
+
+    url: CachedHttpUrl = Field(..., description="Valid URL for the image")
     description: str | None = Field(
         default=None,
         description="Optional description of the image"
     )
 
+    if VALIDATION_CACHE_SIZE > 0:
+        @model_validator(mode="wrap")
+        @classmethod
+        def reuse_validated(cls, data, handler):
+            # Identical image objects → same Image instance
+            return image_cache.wrap(data, handler)
+
 
 class Item(BaseModel):
     name: str = Field(..., description="Name of the item")
@@ -40,10 +130,25 @@ class Product(BaseModel):
     item: Item = Field(..., description="Item details inside the product")
 
 
+# -----------------------------------
+# Response Models
+# -----------------------------------
+# - Declared as response_model (for the docs) and serialized straight
+#   to JSON bytes by pydantic-core (PydanticJSONResponse).
+class ItemResponse(BaseModel):
+    item_id: int
+    item: Item
+
+
+class ProductResponse(BaseModel):
+    product_id: int
+    product: Product
+
+
 # -----------------------------------
 # PUT: Update Item
 # -----------------------------------
-@app.put("/products/{item_id}")
+@app.put("/products/{item_id}", response_model=ItemResponse)
 async def update_product(
     item_id: int = Path(
         ...,
@@ -59,16 +164,13 @@ async def update_product(
     - item_id (must be >= 1)
     - item (validated using Item BaseModel)
     """
-    return {
-        "item_id": item_id,
-        "item": item
-    }
+    return PydanticJSONResponse(ItemResponse(item_id=item_id, item=item))
 
 
 # -----------------------------------
 # POST: Create Product
 # -----------------------------------
-@app.post("/products/{product_id}")
+@app.post("/products/{product_id}", response_model=ProductResponse)
 async def create_product(
     product_id: int = Path(
         ...,
@@ -84,10 +186,7 @@ async def create_product(
     - image (Image Model)
     - item  (Item Model)
     """
-    return {
-        "product_id": product_id,
-        "product": product
-    }
+    return PydanticJSONResponse(ProductResponse(product_id=product_id, product=product))
 
 
 # -----------------------------------
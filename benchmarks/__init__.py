@@ -0,0 +1,5 @@
+"""
+Micro-benchmarks for the lesson apps.
+
+Run them from the repository root, e.g. `python -m benchmarks.item_store`.
+"""
@@ -0,0 +1,121 @@
+"""
+Load test: tail latency past saturation, with and without admission control.
+
+    python -m benchmarks.admission
+
+An open-loop generator sends requests at a fixed rate (they arrive whether
+or not earlier ones finished, like real clients) to a handler that spends
+SERVICE_CPU seconds on the CPU and SERVICE_IO seconds awaiting I/O. The
+offered load goes from half the measured capacity to 4x it.
+
+Latency is measured from each request's scheduled arrival, so time spent
+queued in the event loop counts. Without admission control the queue (and
+p99) grows for as long as the overload lasts; with it, excess requests get
+an immediate 503 and the admitted ones keep a bounded p99.
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.asgi import request
+from shared.admission import AdmissionControl, AdmissionMiddleware
+
+SERVICE_CPU = 0.0005
+SERVICE_IO = 0.002
+MAX_CONCURRENCY = 16
+DURATION = 3.0
+LOAD_FACTORS = (0.5, 0.9, 1.5, 2.0, 4.0)
+
+
+def make_app(admission: AdmissionControl | None):
+    app = FastAPI()
+    if admission is not None:
+        app.add_middleware(AdmissionMiddleware, control=admission, routes=app.routes)
+
+    @app.get("/items")
+    async def read_items():
+        deadline = time.perf_counter() + SERVICE_CPU
+        while time.perf_counter() < deadline:  # CPU work: blocks the event loop
+            pass
+        await asyncio.sleep(SERVICE_IO)  # I/O: other requests run meanwhile
+        return {"ok": True}
+
+    return app
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))]
+
+
+async def capacity(app, seconds=1.0):
+    """Closed-loop throughput with plenty of concurrency: requests/sec."""
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            await request(app, "GET", "/items")
+            done += 1
+
+    await asyncio.gather(*(worker() for _ in range(32)))
+    return done / seconds
+
+
+async def open_loop(app, rate, duration):
+    latencies = []
+    rejected = 0
+
+    async def one(scheduled):
+        nonlocal rejected
+        status, _, _ = await request(app, "GET", "/items")
+        if status == 200:
+            latencies.append(time.perf_counter() - scheduled)
+        else:
+            rejected += 1
+
+    tasks = []
+    started = time.perf_counter()
+    for i in range(int(rate * duration)):
+        scheduled = started + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "goodput": len(latencies) / elapsed,
+        "rejected_pct": 100 * rejected / len(tasks),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run():
+    max_rps = await capacity(make_app(None))
+    print(f"capacity ≈ {max_rps:.0f} req/s  (cpu={SERVICE_CPU * 1000}ms io={SERVICE_IO * 1000}ms per request)\n")
+    print(f"{'offered':>10}  {'mode':<18} {'goodput':>9}  {'rejected':>8}  {'p50':>9}  {'p99':>9}")
+
+    for factor in LOAD_FACTORS:
+        rate = max_rps * factor
+        for label, admission in (
+            ("no admission", None),
+            (f"max_concurrency={MAX_CONCURRENCY}", AdmissionControl(max_concurrency=MAX_CONCURRENCY)),
+        ):
+            stats = await open_loop(make_app(admission), rate, DURATION)
+            print(f"{rate:>6.0f}/s ({factor}x)  {label:<18} {stats['goodput']:>7.0f}/s  "
+                  f"{stats['rejected_pct']:>7.1f}%  {stats['p50_ms']:>7.1f}ms  {stats['p99_ms']:>7.1f}ms")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Throughput / latency benchmark of every lesson app, in-process.
+
+Each app object is called directly through a tiny ASGI client (no server, no
+network), route by route. For every route it reports requests/sec and
+p50 / p95 / p99 latency, and writes the numbers to a JSON file.
+
+    python -m benchmarks.apps                          # all lessons
+    python -m benchmarks.apps --lesson 3 --lesson 9    # only some of them
+    python -m benchmarks.apps --sizes 100 10000        # payload / catalog sizes
+    python -m benchmarks.apps --baseline old.json      # flag p95 regressions
+
+`size` means the catalog size for `3- Query_Parameters` and
+`6- Numeric_Validation`, and the length of the text fields in request bodies
+for the other lessons (e.g. nested `Product`).
+
+`3- Query_Parameters` is run twice per size: with its response cache off
+(what the handlers cost) and on (repeated requests served from the cache),
+reported as "uncached" / "cached" rows.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fastapi
+import pydantic
+
+from benchmarks.asgi import lifespan, request
+from shared.lessons import LESSONS, ROOT, load_lesson
+from shared.store import AsyncStore
+
+
+# -----------------------------------
+# Scenarios: one per route
+# -----------------------------------
+@dataclass
+class Scenario:
+    method: str
+    route: str  # route template, used as the label
+    path: str
+    query: dict = field(default_factory=dict)
+    body: object = None  # callable(size) → JSON body
+
+
+def text(size):
+    return "x" * size
+
+
+def image(size):
+    return {"url": "https://cdn.example.com/img/1.png", "description": text(size)}
+
+
+SCENARIOS = {
+    "1- Intro": [
+        Scenario("GET", "/", "/"),
+        Scenario("POST", "/", "/"),
+        Scenario("PUT", "/", "/"),
+    ],
+    "2- Path_Parameters": [
+        Scenario("GET", "/users", "/users"),
+        Scenario("GET", "/users/{user_id}", "/users/42"),
+        Scenario("GET", "/users/role/{role}/{user_id}", "/users/role/editor/42"),
+        Scenario("GET", "/users/role/{role}", "/users/role/viewer"),
+        Scenario("GET", "/users/roles", "/users/roles", {"any_of": "editor", "none_of": "admin"}),
+    ],
+    "3- Query_Parameters": [
+        Scenario("GET", "/items?id", "/items", {"id": 3}),
+        Scenario("GET", "/items?name", "/items", {"name": "name-7"}),
+        Scenario("GET", "/items?start&end", "/items", {"start": 0, "end": 10}),
+        Scenario("GET", "/items/prices", "/items/prices", {"max_range": 10}),
+        Scenario("GET", "/items/stock", "/items/stock", {"in_stock": "false"}),
+    ],
+    "4- Request_Body": [
+        Scenario("POST", "/items", "/items",
+                 body=lambda size: {"name": "book", "description": text(size), "price": 10.5, "tax": 0.14}),
+        Scenario("PUT", "/items/{item_id}", "/items/1",
+                 body=lambda size: {"name": "book", "description": text(size), "price": 10.5}),
+    ],
+    "5- String_Validation": [
+        Scenario("GET", "/items", "/items", {"name": "book"}),
+        Scenario("GET", "/validate", "/validate", {"name": "Alice", "email": "alice@example.com"}),
+    ],
+    "6- Numeric_Validation": [
+        Scenario("GET", "/items/{item_id}", "/items/7"),
+        Scenario("GET", "/items", "/items", {"min_price": 1, "max_price": 500}),
+        Scenario("GET", "/items?count_only", "/items", {"min_price": 1, "max_price": 500, "count_only": "true"}),
+    ],
+    "7- Body_Multiple_Parameters": [
+        Scenario("PUT", "/items/{item_id}/users/{user_id}", "/items/7/users/42",
+                 body=lambda size: {
+                     "item": {"name": "book", "description": text(size), "price": 10.5},
+                     "user": {"username": "alice", "first_name": "Alice", "last_name": text(size)},
+                     "age": 30,
+                 }),
+    ],
+    "8- Fields": [
+        Scenario("PUT", "/items/{item_id}", "/items/7",
+                 body=lambda size: {"item": {"name": "book", "description": text(min(size, 300)), "price": 10.5}}),
+    ],
+    "9- Nested_Models": [
+        Scenario("PUT", "/products/{item_id}", "/products/7",
+                 body=lambda size: {"name": "book", "description": text(size), "price": 10.5, "image": image(size)}),
+        Scenario("POST", "/products/{product_id}", "/products/7",
+                 body=lambda size: {
+                     "image": image(size),
+                     "item": {"name": "book", "description": text(size), "price": 10.5, "image": image(size)},
+                 }),
+    ],
+}
+
+
+# Lessons whose catalog is replaced by a generated one of `size` items
+CATALOG_LESSONS = ("3- Query_Parameters", "6- Numeric_Validation")
+
+# Lessons with a response cache, benchmarked both with and without it
+CACHED_LESSONS = ("3- Query_Parameters",)
+
+
+def make_catalog(size):
+    return [
+        {"id": i, "name": f"name-{i % 1000}", "price": i % 500 + 1, "stock": i % 3 != 0}
+        for i in range(1, size + 1)
+    ]
+
+
+def setup_lesson(folder, size, cached=False):
+    """
+    Fresh app per (lesson, size), so caches / state never leak between runs.
+    The response cache is off unless `cached`: one client repeating one
+    request would otherwise only measure cache hits.
+    """
+    module = load_lesson(folder)
+    if hasattr(module, "admission"):
+        # Measure the handlers, not the rate limits (one client hammering one route)
+        module.admission.limits.clear()
+        module.admission.max_concurrency = None
+    if hasattr(module, "response_cache") and not cached:
+        # Nothing is kept: every request is a miss and runs the handler
+        module.response_cache.maxsize = 0
+    if folder in CATALOG_LESSONS and isinstance(module.store, AsyncStore):
+        # Same in-memory engine as configured, filled with a generated catalog
+        module.store = AsyncStore(type(module.store.store)(make_catalog(size)))
+    return module
+
+
+# -----------------------------------
+# Runner
+# -----------------------------------
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def run_scenario(app, scenario, size, requests, concurrency, warmup):
+    body = scenario.body(size) if scenario.body else None
+
+    async def call():
+        status, _, _ = await request(app, scenario.method, scenario.path, scenario.query, body)
+        return status
+
+    for _ in range(warmup):
+        await call()
+
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            status = await call()
+            latencies.append(time.perf_counter() - started)
+            errors += status >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 4),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+    }
+
+
+async def run(lessons, sizes, requests, concurrency, warmup):
+    results = []
+    for folder in lessons:
+        # Lessons without a size-dependent route only need one size
+        lesson_sizes = sizes if folder in CATALOG_LESSONS or any(s.body for s in SCENARIOS[folder]) else sizes[:1]
+        # Lessons with a response cache run twice: uncached (the handlers) and cached (hits)
+        modes = (False, True) if folder in CACHED_LESSONS else (None,)
+        for size in lesson_sizes:
+            for cached in modes:
+                app = setup_lesson(folder, size, cached=bool(cached)).app
+                async with lifespan(app):
+                    for scenario in SCENARIOS[folder]:
+                        stats = await run_scenario(app, scenario, size, requests, concurrency, warmup)
+                        row = {"lesson": folder, "method": scenario.method, "route": scenario.route,
+                               "size": size, "cached": cached, **stats}
+                        results.append(row)
+                        cache = "" if cached is None else "cached" if cached else "uncached"
+                        print(f"{folder:<28} {scenario.method:<5} {scenario.route:<34} size={size:<8} {cache:<8} "
+                              f"{stats['rps']:>9.1f} req/s  p50={stats['p50_ms']:.3f}ms  "
+                              f"p95={stats['p95_ms']:.3f}ms  p99={stats['p99_ms']:.3f}ms")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, tolerance):
+    """Print routes whose p95 got slower than the baseline; return their count."""
+    def key(row):
+        # "cached" is None for lessons without a response cache (and in older results files)
+        return row["lesson"], row["method"], row["route"], row["size"], row.get("cached")
+
+    baseline = {key(row): row for row in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = 0
+    for row in results:
+        old = baseline.get(key(row))
+        if old and row["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions += 1
+            cache = "" if row["cached"] is None else f" cached={row['cached']}"
+            print(f"REGRESSION {row['lesson']} {row['method']} {row['route']} size={row['size']}{cache}: "
+                  f"p95 {old['p95_ms']:.3f}ms → {row['p95_ms']:.3f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lesson", action="append", help="lesson number or folder (repeatable)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000])
+    parser.add_argument("--requests", type=int, default=1000, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    lessons = LESSONS
+    if args.lesson:
+        lessons = [folder for folder in LESSONS
+                   if folder in args.lesson or folder.split("-")[0] in args.lesson]
+
+    results = asyncio.run(run(lessons, args.sizes, args.requests, args.concurrency, args.warmup))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "fastapi": fastapi.__version__,
+            "pydantic": pydantic.VERSION,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Validations per second: GET /validate in a loop vs. one POST /validate/batch.
+
+    python -m benchmarks.batch_validation
+
+Both paths run in-process (no network), so the gap is the per-request
+overhead of FastAPI itself, not of the transport.
+"""
+import asyncio
+import random
+import time
+
+from benchmarks.asgi import request
+from shared.lessons import load_lesson
+
+LOOP_PAIRS = 2_000
+BATCH_SIZES = [1_000, 10_000, 100_000]
+
+
+def make_pairs(n):
+    pairs = []
+    for i in range(n):
+        name = random.choice(["Alice", "Bob", "Charlie", "Al", "D4ve"])
+        email = random.choice([f"user{i}@example.com", "not-an-email", f"u{i}@mail.org"])
+        pairs.append({"name": name, "email": email})
+    return pairs
+
+
+async def main():
+    app = load_lesson("5- String_Validation").app
+
+    pairs = make_pairs(LOOP_PAIRS)
+    started = time.perf_counter()
+    for pair in pairs:
+        await request(app, "GET", "/validate", pair)
+    loop_rate = LOOP_PAIRS / (time.perf_counter() - started)
+    print(f"{'GET /validate loop':<28} {LOOP_PAIRS:>8} pairs  {loop_rate:>12,.0f} validations/s")
+
+    for size in BATCH_SIZES:
+        pairs = make_pairs(size)
+        started = time.perf_counter()
+        status, _, _ = await request(app, "POST", "/validate/batch", json_body=pairs)
+        rate = size / (time.perf_counter() - started)
+        assert status == 200
+        print(f"{'POST /validate/batch':<28} {size:>8} pairs  {rate:>12,.0f} validations/s  ({rate / loop_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
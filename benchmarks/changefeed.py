@@ -0,0 +1,117 @@
+"""
+Change feed fan-out: one write pushed to up to 10,000 in-process subscribers.
+
+    python -m benchmarks.changefeed
+
+Each subscriber is an asyncio task iterating its `Subscription` (what the
+SSE / WebSocket endpoints of `3- Query_Parameters` do, minus the socket).
+For each subscriber count it reports:
+    - publish: time spent in `ChangeFeed.publish` per event (encode once,
+      store in the shared ring, wake the waiting subscribers), vs. an
+      asyncio.Queue per subscriber (one put_nowait + one wake-up each)
+    - delivery: time from the first publish until every subscriber has
+      received every event, and deliveries per second
+Then 1% of the subscribers stop reading while 1000 events go by: when they
+read again they are dropped, and the others got every event meanwhile.
+"""
+import asyncio
+import time
+
+from shared.changefeed import ChangeFeed
+
+SUBSCRIBERS = [100, 1_000, 10_000]
+EVENTS = 200
+BURST = 10  # events published back to back before the loop runs the subscribers
+ITEM = {"id": 42, "name": "game", "price": 50.0, "stock": False}
+
+
+async def consume(subscription, received, stalled=None):
+    async for event in subscription:
+        received[0] += 1
+        if stalled is not None:
+            await stalled.wait()  # a client that stopped reading for a while
+            stalled = None
+
+
+class QueueFeed:
+    """The straightforward fan-out: a bounded asyncio.Queue per subscriber."""
+
+    def __init__(self, buffer_size=256):
+        self.buffer_size = buffer_size
+        self.seq = 0
+        self.queues = set()
+        self.encode = ChangeFeed()._encode
+
+    def publish(self, kind, item):
+        self.seq += 1
+        data = self.encode({"seq": self.seq, "type": kind, "item": item})
+        for queue in list(self.queues):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self.queues.discard(queue)
+
+    def subscribe(self):
+        queue = asyncio.Queue(self.buffer_size)
+        self.queues.add(queue)
+
+        async def events():
+            while True:
+                yield await queue.get()
+        return events()
+
+
+async def fan_out(feed, subscribers, events, stalled_share=0.0):
+    received = [0]
+    stalled = asyncio.Event()
+    n_stalled = int(subscribers * stalled_share)
+    tasks = [
+        asyncio.create_task(consume(feed.subscribe(), received, stalled if i < n_stalled else None))
+        for i in range(subscribers)
+    ]
+    await asyncio.sleep(0)  # let every subscriber start waiting
+
+    publishing = 0.0
+    started = time.perf_counter()
+    for seq in range(events):
+        t = time.perf_counter()
+        feed.publish("stock", {**ITEM, "stock": bool(seq % 2)})
+        publishing += time.perf_counter() - t
+        if seq % BURST == BURST - 1:
+            await asyncio.sleep(0)
+
+    # Wait until the readers got everything (stalled ones only got their first event)
+    expected = (subscribers - n_stalled) * events
+    while received[0] - n_stalled < expected:
+        await asyncio.sleep(0)
+    delivery = time.perf_counter() - started
+
+    # The stalled subscribers read again: too far behind, they get "dropped"
+    stalled.set()
+    for _ in range(3):
+        await asyncio.sleep(0)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return publishing / events, delivery
+
+
+def main():
+    print(f"{EVENTS} events, published in bursts of {BURST}\n")
+    for subscribers in SUBSCRIBERS:
+        for name, feed in (("ring", ChangeFeed(history=1000, buffer_size=256)), ("queues", QueueFeed(256))):
+            publish, delivery = asyncio.run(fan_out(feed, subscribers, EVENTS))
+            print(f"subscribers={subscribers:>6,}  {name:<6}  publish={publish * 1000:7.3f}ms/event  "
+                  f"delivery={delivery * 1000:8.1f}ms  {subscribers * EVENTS / delivery:12,.0f} deliveries/s")
+        print()
+
+    subscribers, events = SUBSCRIBERS[-1], 1000
+    feed = ChangeFeed(history=1000, buffer_size=256)
+    publish, delivery = asyncio.run(fan_out(feed, subscribers, events, stalled_share=0.01))
+    stats = feed.stats()
+    print(f"1% stalled, {events} events: dropped={stats['dropped']}  "
+          f"publish={publish * 1000:.3f}ms/event  delivery={delivery * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Thundering herd on `3- Query_Parameters`: CPU with and without coalescing.
+
+    python -m benchmarks.coalescing
+
+Each burst first writes to the catalog (so the response cache is cold) and
+then fires HERD identical concurrent requests at one listing route. Without
+coalescing every request filters, sorts and encodes the same result; with
+it, one request does the work and the others reuse its response.
+"""
+import asyncio
+import os
+import time
+
+from benchmarks.apps import setup_lesson
+from benchmarks.asgi import request
+
+CATALOG_SIZE = 20_000
+HERD = 50
+BURSTS = 5
+ROUTES = [
+    ("/items/prices", {"max_range": 50}),
+    ("/items/stock", {"in_stock": "false"}),
+]
+
+
+async def bursts(module, path, query):
+    app, store = module.app, module.store
+    cpu = wall = 0.0
+    for burst in range(BURSTS):
+        await store.update(1, price=burst % 5 + 1)  # new catalog version: cache miss
+
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        responses = await asyncio.gather(*(request(app, "GET", path, query) for _ in range(HERD)))
+        cpu += time.process_time() - cpu_started
+        wall += time.perf_counter() - wall_started
+        assert all(status == 200 for status, _, _ in responses)
+    return cpu / BURSTS, wall / BURSTS
+
+
+async def run():
+    print(f"catalog={CATALOG_SIZE:,} items, {HERD} identical concurrent requests per burst\n")
+    for path, query in ROUTES:
+        for coalesce in ("0", "1"):
+            os.environ["COALESCE_REQUESTS"] = coalesce
+            module = setup_lesson("3- Query_Parameters", CATALOG_SIZE, cached=True)
+            cpu, wall = await bursts(module, path, query)
+            coalesced = module.flights.stats()["coalesced"] if module.flights else 0
+            label = "coalescing" if coalesce == "1" else "no coalescing"
+            print(f"{path:<14} {label:<14} cpu/burst={cpu * 1000:8.1f}ms  wall/burst={wall * 1000:8.1f}ms  "
+                  f"coalesced={coalesced}/{HERD * BURSTS}")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Filters over a list of dicts vs. the NumPy-backed ColumnarStore.
+
+    python -m benchmarks.columnar
+
+Needs NumPy (`pip install numpy`). Each query is timed end to end, including
+turning the selected rows back into dicts, so the columnar engine wins on
+selective filters, while a filter that keeps a third of the catalog is
+dominated by building the result dicts.
+"""
+import random
+import time
+
+from shared.columnar import ColumnarStore
+
+SIZES = [10**4, 10**5, 10**6]
+REPEAT = 5
+
+
+def make_items(n):
+    return [
+        {"id": i, "name": f"name-{i % 1000}", "price": random.randint(1, 1000), "stock": i % 3 != 0}
+        for i in range(1, n + 1)
+    ]
+
+
+def best_ms(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    # Query mix: out-of-stock (~33% rows), cheap items (~1% rows), one name (~0.1% rows)
+    queries = {
+        "stock=False": (
+            lambda items: [it for it in items if not it["stock"]],
+            lambda store: store.in_stock(False),
+        ),
+        "price<=10": (
+            lambda items: sorted((it for it in items if it["price"] <= 10), key=lambda x: x["price"], reverse=True),
+            lambda store: store.by_price(max_price=10),
+        ),
+        "name=name-7": (
+            lambda items: [it for it in items if it["name"] == "name-7"],
+            lambda store: store.find_by_name("name-7"),
+        ),
+    }
+
+    print(f"{'rows':>8} | {'query':<12} | {'list (ms)':>10} | {'columnar (ms)':>13} | {'speedup':>7}")
+    for n in SIZES:
+        items = make_items(n)
+        store = ColumnarStore(items)
+        for label, (list_query, columnar_query) in queries.items():
+            list_ms = best_ms(lambda: list_query(items))
+            columnar_ms = best_ms(lambda: columnar_query(store))
+            print(f"{n:>8} | {label:<12} | {list_ms:>10.2f} | {columnar_ms:>13.2f} | {list_ms / columnar_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
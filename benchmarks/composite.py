@@ -0,0 +1,84 @@
+"""
+Cold start and memory: nine separate lesson processes vs. one `main:app`.
+
+    python -m benchmarks.composite
+
+Every measurement runs in a fresh Python process (imports are cached, so an
+in-process number would be meaningless). Each process reports:
+    - import   time to import the app module(s)
+    - first    time to answer the first request
+    - rss      resident memory once that request is served
+
+Compared setups:
+    - separate        one process per lesson, numbers summed over the nine
+    - main (cold)     main:app after one request to the lesson index
+    - main (all)      main:app after one request to every lesson prefix
+"""
+import json
+import subprocess
+import sys
+
+from shared.lessons import LESSONS, ROOT, url_prefix
+
+ROUNDS = 3
+
+# Runs inside the child process; prints one JSON line
+PROBE = """
+import asyncio, json, resource, sys, time
+started = time.perf_counter()
+{load}
+imported = time.perf_counter()
+
+from benchmarks.asgi import request
+
+async def first_requests():
+    for path in {paths!r}:
+        status, _, _ = await request(app, "GET", path)
+        assert status < 500, (path, status)
+
+asyncio.run(first_requests())
+answered = time.perf_counter()
+
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open("/proc/self/status") as status_file:
+        rss_kb = next(int(line.split()[1]) for line in status_file if line.startswith("VmRSS"))
+except (OSError, StopIteration):
+    pass
+print(json.dumps({{"import_s": imported - started, "first_s": answered - imported, "rss_mb": rss_kb / 1024}}))
+"""
+
+
+def probe(load, paths):
+    """Best-of-ROUNDS timings (and the RSS of that run) in fresh interpreters."""
+    code = PROBE.format(load=load, paths=paths)
+    runs = []
+    for _ in range(ROUNDS):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+    return min(runs, key=lambda run: run["import_s"] + run["first_s"])
+
+
+def separate():
+    total = {"import_s": 0.0, "first_s": 0.0, "rss_mb": 0.0}
+    for folder in LESSONS:
+        run = probe(f"from shared.lessons import load_lesson\napp = load_lesson({folder!r}).app", ["/"])
+        for key in total:
+            total[key] += run[key]
+    return total
+
+
+def report(label, run):
+    print(f"{label:<22} import={run['import_s'] * 1000:8.1f}ms  "
+          f"first request={run['first_s'] * 1000:8.1f}ms  rss={run['rss_mb']:7.1f}MB")
+
+
+def main():
+    report("separate (9 procs)", separate())
+    report("main (cold)", probe("from main import app", ["/"]))
+    report("main (all lessons)", probe("from main import app", ["/"] + [url_prefix(f) + "/" for f in LESSONS]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Gzip on large responses: bytes saved vs. CPU spent per request.
+
+    python -m benchmarks.compression
+
+Large full-catalog listings from `3- Query_Parameters` (one JSON body, and
+NDJSON streamed) and large nested `Product` echoes from `9- Nested_Models`,
+requested without Accept-Encoding (baseline) and with gzip at fixed levels 1,
+6 and 9 and with the adaptive level. Reports the response size and the CPU
+time per request; the difference to the baseline is the cost of compressing.
+The benchmark itself keeps the CPU busy, so the adaptive level drops below
+its size-based default as the load estimate rises.
+"""
+import asyncio
+import random
+import string
+import time
+
+from benchmarks.apps import setup_lesson
+from benchmarks.asgi import request
+
+CATALOG_SIZE = 20_000
+REQUESTS = 50
+MODES = ["identity", 1, 6, 9, "adaptive"]
+
+
+def words(size):
+    # Less repetitive than "xxxx…", closer to real descriptions
+    rng = random.Random(size)
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(size // 6))
+
+
+def product(size):
+    image = {"url": "https://cdn.example.com/img/1.png", "description": words(size)}
+    return {"name": "book", "description": words(size), "price": 10.5, "image": image}
+
+
+SCENARIOS = [
+    ("3- Query_Parameters", "GET /items (2,000 items)", "GET", "/items", {"start": 0, "end": 2000}, None),
+    ("3- Query_Parameters", "GET /items/stock (NDJSON)", "GET", "/items/stock", {"in_stock": "true", "stream": "true"}, None),
+    ("9- Nested_Models", "PUT /products (20KB text fields)", "PUT", "/products/7", {}, product(20_000)),
+    ("9- Nested_Models", "PUT /products (200KB text fields)", "PUT", "/products/7", {}, product(200_000)),
+]
+
+
+async def measure(module, method, path, query, body, mode):
+    headers = {} if mode == "identity" else {"accept-encoding": "gzip"}
+    if isinstance(mode, int):
+        module.compression.level = lambda size: mode  # fixed level instead of the adaptive one
+
+    await request(module.app, method, path, query, body, headers)  # warm up (fills the response cache)
+    size = 0
+    started = time.process_time()
+    for _ in range(REQUESTS):
+        status, _, payload = await request(module.app, method, path, query, body, headers)
+        assert status == 200, status
+        size = len(payload)
+    return size, (time.process_time() - started) / REQUESTS
+
+
+async def run():
+    print(f"{REQUESTS} requests per row, catalog={CATALOG_SIZE:,} items\n")
+    for folder, label, method, path, query, body in SCENARIOS:
+        print(label)
+        baseline_size = baseline_cpu = None
+        for mode in MODES:
+            module = setup_lesson(folder, CATALOG_SIZE)
+            size, cpu = await measure(module, method, path, query, body, mode)
+            if mode == "identity":
+                baseline_size, baseline_cpu = size, cpu
+                print(f"  {'identity':<12} {size / 1024:9.1f}KB              cpu/request={cpu * 1000:7.2f}ms")
+                continue
+            name = f"level {mode}" if isinstance(mode, int) else "adaptive"
+            saved = 1 - size / baseline_size
+            print(f"  {name:<12} {size / 1024:9.1f}KB  saved={saved:6.1%}  cpu/request={cpu * 1000:7.2f}ms  "
+                  f"gzip cost={(cpu - baseline_cpu) * 1000:+7.2f}ms"
+                  + (f"  levels used={module.compression.levels}" if mode == "adaptive" else ""))
+        print()
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Lookup latency: linear scan over a list vs. the hash-indexed ItemStore.
+
+    python -m benchmarks.item_store
+
+The indexed lookups should stay flat from 10^3 to 10^6 items, while the
+list scan (what `3- Query_Parameters` used to do) grows with the catalog.
+"""
+import random
+import time
+
+from shared.store import ItemStore
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+MATCHES_PER_NAME = 10  # keep the result size constant so only lookup cost varies
+
+
+def make_items(n):
+    return [
+        {"id": i, "name": f"name-{i % (n // MATCHES_PER_NAME)}", "price": i % 500, "stock": i % 3 != 0}
+        for i in range(1, n + 1)
+    ]
+
+
+def per_call_us(fn, args, repeat):
+    started = time.perf_counter()
+    for arg in args[:repeat]:
+        fn(arg)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    print(f"{'items':>9} | {'scan id':>10} | {'index id':>10} | {'scan name':>10} | {'index name':>10}  (µs/lookup)")
+    for n in SIZES:
+        items = make_items(n)
+        store = ItemStore(items)
+        ids = [random.randint(1, n) for _ in range(10_000)]
+        names = [f"name-{random.randrange(n // MATCHES_PER_NAME)}" for _ in range(10_000)]
+
+        # Scans are slow at 10^6, so they get fewer repetitions
+        scan_repeat = max(5, 10_000 * 1000 // n)
+
+        scan_id = per_call_us(
+            lambda i: next((it for it in items if it["id"] == i), None), ids, scan_repeat)
+        index_id = per_call_us(store.get, ids, 10_000)
+        scan_name = per_call_us(
+            lambda name: [it for it in items if it["name"] == name], names, scan_repeat)
+        index_name = per_call_us(store.find_by_name, names, 10_000)
+
+        print(f"{n:>9} | {scan_id:>10.2f} | {index_id:>10.2f} | {scan_name:>10.2f} | {index_name:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Per-request overhead of MetricsMiddleware.
+
+    python -m benchmarks.metrics_overhead
+
+Times the same requests against the same app with and without the
+middleware: once on a bare ASGI app (isolates the middleware's own cost) and
+once on a small FastAPI app with a path parameter.
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.asgi import request
+from shared.metrics import MetricsMiddleware
+
+REQUESTS = 20_000
+ROUNDS = 5
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def fastapi_app(with_metrics):
+    app = FastAPI()
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    return app
+
+
+async def per_request_us(app, path):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await request(app, "GET", path)
+        best = min(best, (time.perf_counter() - started) / REQUESTS)
+    return best * 1e6
+
+
+async def main():
+    cases = {
+        "bare ASGI app": (bare_app, MetricsMiddleware(bare_app), "/ping"),
+        "FastAPI /items/{item_id}": (fastapi_app(False), fastapi_app(True), "/items/7"),
+    }
+    print(f"{'app':<26} | {'without (µs)':>12} | {'with (µs)':>10} | {'overhead (µs)':>13}")
+    for label, (plain, instrumented, path) in cases.items():
+        without = await per_request_us(plain, path)
+        with_metrics = await per_request_us(instrumented, path)
+        print(f"{label:<26} | {without:>12.2f} | {with_metrics:>10.2f} | {with_metrics - without:>13.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
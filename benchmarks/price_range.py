@@ -0,0 +1,71 @@
+"""
+Price-range queries on `6- Numeric_Validation`: cost vs. catalog size.
+
+    python -m benchmarks.price_range
+
+GET /items?min_price=..&max_price=.. for catalogs of growing size, with the
+range chosen so it matches about MATCHES items (at least one price value).
+For each size: one page of LIMIT items, count_only=true, and the same query
+answered by a full scan of the list (filter every item, then sort the
+matches), which is what the endpoint would cost without the price index.
+With the index the page and count timings stay flat as the catalog grows.
+"""
+import asyncio
+import time
+
+from benchmarks.apps import make_catalog, setup_lesson
+from benchmarks.asgi import request
+
+SIZES = [10_000, 100_000, 1_000_000]
+MATCHES = 1_000
+LIMIT = 10
+REQUESTS = 200
+
+
+def scan(items, min_price, max_price, skip, limit):
+    matches = [item for item in items if min_price <= item["price"] <= max_price]
+    matches.sort(key=lambda item: (-item["price"], item["id"]))
+    return len(matches), matches[skip:skip + limit]
+
+
+async def timed(fn):
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await fn()
+    return (time.perf_counter() - started) / REQUESTS
+
+
+async def run():
+    print(f"~{MATCHES:,} matching items per query, page size {LIMIT}, {REQUESTS} requests each\n")
+    for size in SIZES:
+        module = setup_lesson("6- Numeric_Validation", size)
+        app = module.app
+        items = make_catalog(size)
+        # make_catalog prices cycle through 1..500, so each price has size / 500 items
+        max_price = 100
+        min_price = max_price - max(1, MATCHES * 500 // size) + 1
+        query = {"min_price": min_price, "max_price": max_price, "skip": 50, "limit": LIMIT}
+
+        async def page():
+            status, _, _ = await request(app, "GET", "/items", query)
+            assert status == 200
+
+        async def count():
+            status, _, _ = await request(app, "GET", "/items", {**query, "count_only": "true"})
+            assert status == 200
+
+        async def full_scan():
+            scan(items, min_price, max_price, 50, LIMIT)
+
+        total = await module.store.count_by_price(min_price, max_price)
+        page_time, count_time, scan_time = await timed(page), await timed(count), await timed(full_scan)
+        print(f"n={size:>9,}  matches={total:>6,}  page={page_time * 1000:7.3f}ms  "
+              f"count_only={count_time * 1000:7.3f}ms  scan (no HTTP)={scan_time * 1000:9.3f}ms")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Per-request overhead of ProfilingMiddleware, when it profiles and when it doesn't.
+
+    python -m benchmarks.profiling_overhead
+
+First on a bare ASGI app, to isolate what the middleware costs a request
+it doesn't profile. Then on a small FastAPI app (path parameter + query
+validation + JSON response): without the middleware, with it but not
+triggered (header only, and with a 1% sampling rate), and with
+`X-Profile: 1` on every request, i.e. what a profiled request costs
+(cProfile on, then the pstats file written to a temporary directory).
+"""
+import asyncio
+import tempfile
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.asgi import request
+from shared.profiling import Profiler, ProfilingMiddleware
+
+REQUESTS = 20_000
+PROFILED_REQUESTS = 500
+ROUNDS = 5
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def fastapi_app(profiler=None):
+    app = FastAPI()
+    if profiler is not None:
+        app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int, q: str = None):
+        return {"item_id": item_id, "q": q, "tags": ["a", "b", "c"]}
+
+    return app
+
+
+async def per_request_us(app, headers=None, requests=REQUESTS):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await request(app, "GET", "/items/7", query={"q": "x"}, headers=headers)
+        best = min(best, (time.perf_counter() - started) / requests)
+    return best * 1e6
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        without = await per_request_us(bare_app)
+        with_middleware = await per_request_us(ProfilingMiddleware(bare_app, Profiler(directory)))
+        print(f"bare ASGI app: {without:.2f}µs without, {with_middleware:.2f}µs with the middleware "
+              f"(not triggered): {with_middleware - without:+.2f}µs\n")
+
+        cases = [
+            ("no middleware", fastapi_app(), None, REQUESTS),
+            ("not triggered", fastapi_app(Profiler(directory)), None, REQUESTS),
+            ("not triggered, 1% sampled", fastapi_app(Profiler(directory, sample_rate=0.01)), None, REQUESTS),
+            ("X-Profile: 1 (profiled)", fastapi_app(Profiler(directory)), {"x-profile": "1"}, PROFILED_REQUESTS),
+        ]
+        baseline = None
+        print(f"{'case':<27} | {'per request (µs)':>16} | {'overhead (µs)':>13}")
+        for label, app, headers, requests in cases:
+            elapsed = await per_request_us(app, headers, requests)
+            baseline = elapsed if baseline is None else baseline
+            print(f"{label:<27} | {elapsed:>16.2f} | {elapsed - baseline:>13.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Role indexes for 10 million users: Bitmap vs. set of ids vs. sorted array.
+
+    python -m benchmarks.role_bitmaps
+
+Each user has the roles of `2- Path_Parameters` with a skewed distribution
+(1% admins, 10% editors, 90% viewers, users can have several). For each way
+of indexing "users with role R" it reports the memory of the three indexes
+(tracemalloc) and the time of the operations the lesson routes use:
+membership test, count, "admins who are editors", "editors who are not
+admins", and the first page of 100 viewers.
+"""
+import gc
+import random
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+
+from shared.bitmap import Bitmap
+
+USERS = 10_000_000
+SHARES = {"admin": 0.01, "editor": 0.10, "viewer": 0.90}
+PROBES = 100_000
+
+
+def make_roles():
+    # role → sorted ids, the input every index is built from
+    rng = random.Random(7)
+    ids = {role: array("q") for role in SHARES}
+    for user_id in range(1, USERS + 1):
+        for role, share in SHARES.items():
+            if rng.random() < share:
+                ids[role].append(user_id)
+    return ids
+
+
+# -----------------------------------
+# The three indexes, with the same operations
+# -----------------------------------
+class BitmapIndex:
+    build = staticmethod(lambda ids: Bitmap(ids))
+    contains = staticmethod(lambda index, user_id: user_id in index)
+    count = staticmethod(len)
+    both = staticmethod(lambda a, b: len(a & b))
+    minus = staticmethod(lambda a, b: len(a - b))
+
+    @staticmethod
+    def first(index, n):
+        page = []
+        for user_id in index:
+            page.append(user_id)
+            if len(page) == n:
+                break
+        return page
+
+
+class SetIndex:
+    build = staticmethod(set)
+    contains = staticmethod(lambda index, user_id: user_id in index)
+    count = staticmethod(len)
+    both = staticmethod(lambda a, b: len(a & b))
+    minus = staticmethod(lambda a, b: len(a - b))
+    first = staticmethod(lambda index, n: sorted(index)[:n])  # a set has no order
+
+
+class SortedArrayIndex:
+    build = staticmethod(lambda ids: array("q", ids))
+    count = staticmethod(len)
+    first = staticmethod(lambda index, n: list(index[:n]))
+
+    @staticmethod
+    def contains(index, user_id):
+        i = bisect_left(index, user_id)
+        return i < len(index) and index[i] == user_id
+
+    @staticmethod
+    def both(a, b):
+        # Merge walk would be O(len(a) + len(b)); probing the smaller one is cheaper here
+        small, large = (a, b) if len(a) < len(b) else (b, a)
+        return sum(SortedArrayIndex.contains(large, user_id) for user_id in small)
+
+    @staticmethod
+    def minus(a, b):
+        return sum(not SortedArrayIndex.contains(b, user_id) for user_id in a)
+
+
+def timed(fn, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def measure(kind, role_ids, probes):
+    # Memory first (tracemalloc slows allocations down), then the timed build
+    gc.collect()
+    tracemalloc.start()
+    index = {role: kind.build(ids) for role, ids in role_ids.items()}
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del index
+    gc.collect()
+
+    started = time.perf_counter()
+    index = {role: kind.build(ids) for role, ids in role_ids.items()}
+    build = time.perf_counter() - started
+
+    admin, editor, viewer = index["admin"], index["editor"], index["viewer"]
+    contains = timed(lambda: [kind.contains(admin, user_id) for user_id in probes]) / len(probes)
+    results = {
+        "memory": memory,
+        "build": build,
+        "contains": contains,
+        "count": timed(lambda: kind.count(viewer), 1000),
+        "admin & editor": timed(lambda: kind.both(admin, editor), 3),
+        "editor - admin": timed(lambda: kind.minus(editor, admin), 3),
+        "first 100 viewers": timed(lambda: kind.first(viewer, 100), 3),
+    }
+    # The indexes are freed on return (the next measure() starts with gc.collect())
+    return results
+
+
+def main():
+    print(f"Building role memberships for {USERS:,} users ...")
+    role_ids = make_roles()
+    print("  " + ", ".join(f"{role}={len(ids):,}" for role, ids in role_ids.items()) + "\n")
+    probes = random.Random(1).sample(range(1, USERS + 1), PROBES)
+
+    for name, kind in (("Bitmap", BitmapIndex), ("set", SetIndex), ("sorted array", SortedArrayIndex)):
+        r = measure(kind, role_ids, probes)
+        print(f"{name:<13} memory={r['memory'] / 2**20:8.1f}MB  build={r['build']:6.2f}s  "
+              f"contains={r['contains'] * 1e9:6.0f}ns  count={r['count'] * 1e6:6.2f}us  "
+              f"admin&editor={r['admin & editor'] * 1000:8.2f}ms  editor-admin={r['editor - admin'] * 1000:8.2f}ms  "
+              f"first 100 viewers={r['first 100 viewers'] * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Typeahead name search: full scan vs. NameIndex, catalog sizes up to 10^6.
+
+    python -m benchmarks.search
+
+Every query is typed one keystroke at a time ("g", "ga", "gam", ...), like a
+search box does, and each keystroke asks for the first LIMIT matches. The
+scan checks every item's name (what `name ==` filtering over a list costs,
+with `startswith` / `in` instead); the index answers from `ItemStore.search`.
+Also reports the cost of keeping the index up to date on writes.
+"""
+import random
+import time
+
+from shared.store import ItemStore
+
+SIZES = [10_000, 100_000, 1_000_000]
+LIMIT = 10
+QUERIES = ["game", "stor", "lamp"]  # prefix
+SUBSTRINGS = ["ame", "ight", "tor"]  # substring
+SYLLABLES = ["ga", "me", "st", "or", "la", "mp", "li", "ght", "bo", "ok", "ca", "de", "ri", "ve", "to", "ne"]
+
+
+def make_catalog(size):
+    # About one distinct name per 4 items, 2-4 syllables each (e.g. "gamela", "storlight")
+    rng = random.Random(size)
+    names = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(max(size // 4, 1))]
+    return [{"id": i, "name": rng.choice(names), "price": i % 500 + 1, "stock": True} for i in range(1, size + 1)]
+
+
+def scan(items, query, substring, limit):
+    # The naive version: test every name, sort the matches, keep the first `limit`
+    query = query.casefold()
+    if substring:
+        matches = [item for item in items if query in item["name"].casefold()]
+    else:
+        matches = [item for item in items if item["name"].casefold().startswith(query)]
+    matches.sort(key=lambda item: (not item["name"].casefold().startswith(query), item["name"].casefold(), item["id"]))
+    return matches[:limit]
+
+
+def per_keystroke(fn, words):
+    timings = []
+    for word in words:
+        for end in range(1, len(word) + 1):
+            started = time.perf_counter()
+            fn(word[:end])
+            timings.append(time.perf_counter() - started)
+    return sum(timings) / len(timings)
+
+
+def main():
+    print(f"mean time per keystroke, limit={LIMIT}\n")
+    for size in SIZES:
+        items = make_catalog(size)
+        started = time.perf_counter()
+        store = ItemStore(dict(item) for item in items)
+        build = time.perf_counter() - started
+
+        for label, words, substring in (("prefix", QUERIES, False), ("substring", SUBSTRINGS, True)):
+            naive = per_keystroke(lambda q: scan(items, q, substring, LIMIT), words)
+            indexed = per_keystroke(lambda q: store.search(q, substring, LIMIT), words)
+            assert [i["id"] for i in store.search(words[0], substring, LIMIT)] == \
+                [i["id"] for i in scan(items, words[0], substring, LIMIT)]
+            print(f"n={size:>9,}  {label:<9}  scan={naive * 1000:9.3f}ms  index={indexed * 1000:8.3f}ms  "
+                  f"speedup={naive / indexed:8.1f}x")
+
+        # Incremental maintenance: rename items (new names go into the index, unused ones leave it)
+        started = time.perf_counter()
+        for item_id in range(1, 1001):
+            store.update(item_id, name=f"renamed{item_id}")
+        update = (time.perf_counter() - started) / 1000
+        print(f"n={size:>9,}  store build={build:.2f}s ({len(store._search):,} distinct names)  "
+              f"rename={update * 1e6:.1f}us\n")
+
+
+if __name__ == "__main__":
+    main()
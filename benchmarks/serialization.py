@@ -0,0 +1,56 @@
+"""
+Response encoding cost for nested `Product` payloads (9- Nested_Models).
+
+    python -m benchmarks.serialization
+
+Compares the two ways of turning the endpoint result into response bytes:
+    - before: dict with models → jsonable_encoder → JSONResponse (json.dumps)
+    - after:  ProductResponse model → PydanticJSONResponse (pydantic-core to_json)
+"""
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from shared.lessons import load_lesson
+from shared.responses import PydanticJSONResponse
+
+SIZES = [10, 1_000, 100_000]  # length of every description field
+REPEAT = 2_000
+
+
+def make_product(lesson, size):
+    image = {"url": "https://cdn.example.com/img/1.png", "description": "x" * size}
+    return lesson.Product.model_validate({
+        "image": image,
+        "item": {"name": "book", "description": "x" * size, "price": 10.5, "image": image},
+    })
+
+
+def per_call_us(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    lesson = load_lesson("9- Nested_Models")
+    print(f"{'description size':>16} | {'jsonable_encoder (µs)':>21} | {'pydantic-core (µs)':>18} | {'speedup':>7}")
+    for size in SIZES:
+        product = make_product(lesson, size)
+        repeat = max(50, REPEAT // max(1, size // 1000))
+
+        def before():
+            return JSONResponse(jsonable_encoder({"product_id": 1, "product": product})).body
+
+        def after():
+            return PydanticJSONResponse(lesson.ProductResponse(product_id=1, product=product)).body
+
+        old_us = per_call_us(before, repeat)
+        new_us = per_call_us(after, repeat)
+        print(f"{size:>16} | {old_us:>21.2f} | {new_us:>18.2f} | {old_us / new_us:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Shared-memory catalog across worker processes: visibility check + memory.
+
+    python -m benchmarks.shared_catalog
+
+1. Visibility: WORKERS processes each load `3- Query_Parameters` with
+   CATALOG_ENGINE=shm (like `uvicorn api:app --workers N`). They all read
+   item 2 (warming their response caches), then worker 0 changes it with
+   PATCH /items/2 and every worker must see the new price and stock on
+   its next GET. Exits with status 1 if one of them doesn't.
+
+2. Memory: proportional set size (PSS, shared pages split between the
+   processes mapping them) added per worker by a catalog of CATALOG_SIZE
+   items, private `ItemStore` copies vs. one shared segment.
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import uuid
+
+WORKERS = 4
+CATALOG_SIZE = 200_000
+
+
+def pss_mb() -> float:
+    try:
+        with open("/proc/self/smaps_rollup") as smaps:
+            kb = next(int(line.split()[1]) for line in smaps if line.startswith("Pss:"))
+    except (OSError, StopIteration):
+        import resource
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / 1024
+
+
+# -----------------------------------
+# 1. A write in one worker is visible in all of them
+# -----------------------------------
+def visibility_worker(index, shm_name, ready, written, results):
+    os.environ["CATALOG_ENGINE"] = "shm"
+    os.environ["CATALOG_SHM"] = shm_name
+    from benchmarks.asgi import request
+    from shared.lessons import load_lesson
+
+    app = load_lesson("3- Query_Parameters").app
+
+    async def run():
+        await request(app, "GET", "/items", {"id": 2})  # cached in this worker now
+        ready.wait()
+        if index == 0:
+            await request(app, "PATCH", "/items/2", {"price": 99.5, "stock": "false"})
+            written.set()
+        written.wait()
+        _, _, body = await request(app, "GET", "/items", {"id": 2})
+        results.put((index, body.decode()))
+
+    asyncio.run(run())
+
+
+def check_visibility() -> bool:
+    context = multiprocessing.get_context("spawn")
+    shm_name = f"catalog_check_{uuid.uuid4().hex[:8]}"
+    ready, written, results = context.Barrier(WORKERS), context.Event(), context.Queue()
+    workers = [
+        context.Process(target=visibility_worker, args=(i, shm_name, ready, written, results))
+        for i in range(WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+    seen = dict(results.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join()
+
+    from shared.shm_store import SharedMemoryStore
+    store = SharedMemoryStore(shm_name)
+    store.unlink()
+    store.close()
+
+    ok = True
+    for index, body in sorted(seen.items()):
+        visible = '"price":99.5' in body and '"stock":false' in body
+        ok &= visible
+        print(f"worker {index}: {'sees the write' if visible else 'STALE'}  {body}")
+    return ok
+
+
+# -----------------------------------
+# 2. Memory per worker
+# -----------------------------------
+def make_items(n):
+    return [{"id": i, "name": f"name-{i % 1000}", "price": i % 500 + 1, "stock": i % 3 != 0} for i in range(1, n + 1)]
+
+
+def memory_worker(engine, shm_name, ready, results):
+    from shared.shm_store import SharedMemoryStore
+    from shared.store import ItemStore
+
+    before = pss_mb()
+    if engine == "memory":
+        store = ItemStore(make_items(CATALOG_SIZE))
+    else:
+        store = SharedMemoryStore(shm_name)  # attach, no seed
+    store.by_price(1, 2)  # builds the local indexes, touches every record
+    ready.wait()  # every worker has mapped the segment: PSS splits it evenly
+    results.put(pss_mb() - before)
+    ready.wait()
+
+
+def measure_memory(engine) -> list[float]:
+    from shared.shm_store import SharedMemoryStore
+
+    context = multiprocessing.get_context("spawn")
+    shm_name = f"catalog_bench_{uuid.uuid4().hex[:8]}"
+    owner = None
+    if engine == "shm":
+        owner = SharedMemoryStore(shm_name, seed=make_items(CATALOG_SIZE), capacity=CATALOG_SIZE)
+    ready, results = context.Barrier(WORKERS), context.Queue()
+    workers = [context.Process(target=memory_worker, args=(engine, shm_name, ready, results)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    added = [results.get(timeout=120) for _ in workers]
+    for worker in workers:
+        worker.join()
+    if owner is not None:
+        owner.unlink()
+        owner.close()
+    return added
+
+
+def main():
+    print(f"Visibility across {WORKERS} workers (3- Query_Parameters, CATALOG_ENGINE=shm)")
+    ok = check_visibility()
+
+    print(f"\nMemory added per worker by a {CATALOG_SIZE:,}-item catalog ({WORKERS} workers, PSS)")
+    for engine in ("memory", "shm"):
+        added = measure_memory(engine)
+        print(f"{engine:<8} per worker {sum(added) / len(added):7.1f}MB   all workers {sum(added):7.1f}MB")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+In-memory catalog vs. SQLite catalog under concurrent load.
+
+    python -m benchmarks.sqlite_store
+
+Many concurrent tasks run a read-heavy mix (id lookups, name lookups, small
+price ranges, keyset pages, ~5% writes) against each backend through the
+same async interface the endpoints use.
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from shared.sqlite_store import SQLiteItemStore
+from shared.store import AsyncStore, ItemStore
+
+CATALOG_SIZE = 100_000
+OPERATIONS = 5_000
+CONCURRENCY = [1, 16, 64]
+POOL_SIZES = [1, 4, 8]
+
+
+def make_items(n):
+    return [
+        {"id": i, "name": f"name-{i % 10_000}", "price": random.randint(1, 10_000), "stock": i % 3 != 0}
+        for i in range(1, n + 1)
+    ]
+
+
+async def operation(store):
+    roll = random.random()
+    if roll < 0.05:
+        await store.update(random.randint(1, CATALOG_SIZE), price=random.randint(1, 10_000))
+    elif roll < 0.45:
+        await store.get(random.randint(1, CATALOG_SIZE))
+    elif roll < 0.70:
+        await store.find_by_name(f"name-{random.randrange(10_000)}")
+    elif roll < 0.90:
+        low = random.randint(1, 9_990)
+        await store.by_price(low, low + 5)
+    else:
+        await store.page_after(random.randint(1, CATALOG_SIZE), 20)
+
+
+async def run(store, concurrency):
+    latencies = []
+    remaining = OPERATIONS
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await operation(store)
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0)  # like a new request: let waiting tasks run first
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return OPERATIONS / elapsed, latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.95)] * 1000
+
+
+async def main():
+    items = make_items(CATALOG_SIZE)
+    print(f"{'backend':<18} | {'concurrency':>11} | {'ops/s':>9} | {'p50 (ms)':>9} | {'p95 (ms)':>9}")
+
+    backends = [("memory", lambda: AsyncStore(ItemStore([dict(item) for item in items])))]
+    with tempfile.TemporaryDirectory() as tmp:
+        for pool_size in POOL_SIZES:
+            path = os.path.join(tmp, f"catalog-{pool_size}.db")
+            backends.append((f"sqlite (pool={pool_size})",
+                             lambda path=path, pool_size=pool_size: SQLiteItemStore(path, items, pool_size)))
+
+        for label, make_store in backends:
+            store = make_store()
+            for concurrency in CONCURRENCY:
+                rate, p50, p95 = await run(store, concurrency)
+                print(f"{label:<18} | {concurrency:>11} | {rate:>9,.0f} | {p50:>9.3f} | {p95:>9.3f}")
+            await store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
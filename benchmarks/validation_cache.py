@@ -0,0 +1,52 @@
+"""
+`Product` validation throughput with and without the validation cache.
+
+    python -m benchmarks.validation_cache
+
+Payloads draw their image URLs from a pool of a few thousand CDN URLs with
+a skewed (Zipf-like) popularity, like real traffic: a few images are in
+most requests, most images are rare.
+"""
+import random
+import time
+
+from shared.lessons import load_lesson
+
+PRODUCTS = 50_000
+URL_POOL = 3_000
+CACHE_SIZES = [0, 512, 4096]
+
+
+def make_payloads(n):
+    urls = [f"https://cdn.example.com/products/{i}/main.png?w=800" for i in range(URL_POOL)]
+    weights = [1 / (rank + 1) for rank in range(URL_POOL)]
+    payloads = []
+    for url, other in zip(random.choices(urls, weights, k=n), random.choices(urls, weights, k=n)):
+        payloads.append({
+            "image": {"url": url, "description": "Main image"},
+            "item": {"name": "book", "price": 10.5, "image": {"url": other}},
+        })
+    return payloads
+
+
+def main():
+    lesson = load_lesson("9- Nested_Models")
+    payloads = make_payloads(PRODUCTS)
+
+    print(f"{'cache size':>10} | {'products/s':>11} | {'url hit rate':>12} | {'image hit rate':>14}")
+    for size in CACHE_SIZES:
+        for cache in (lesson.url_cache, lesson.image_cache):
+            cache.maxsize = size
+            cache.clear()
+
+        started = time.perf_counter()
+        for payload in payloads:
+            lesson.Product.model_validate(payload)
+        rate = PRODUCTS / (time.perf_counter() - started)
+
+        print(f"{size:>10} | {rate:>11,.0f} | {lesson.url_cache.stats()['hit_rate']:>12.1%} | "
+              f"{lesson.image_cache.stats()['hit_rate']:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
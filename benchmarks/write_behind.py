@@ -0,0 +1,92 @@
+"""
+Write-behind on `4- Request_Body`: handler latency vs. storage latency.
+
+    python -m benchmarks.write_behind
+
+The catalog store is slowed down by STORE_LATENCY per call (a remote
+database, a busy disk). CONCURRENCY clients send REQUESTS POST /items in
+total. For every request it reports how long the client waited for the 202
+and how long until the write was actually saved (its ticket is "done"),
+plus how many store calls were needed for all the writes. batch_size=1 is
+one store call per write, applied one after the other.
+"""
+import asyncio
+import json
+import time
+
+from benchmarks.apps import setup_lesson
+from benchmarks.asgi import lifespan, request
+
+STORE_LATENCY = 0.005
+REQUESTS = 2_000
+CONCURRENCY = 50
+
+
+def slow(store, calls):
+    # Wrap the store's write methods: each call costs STORE_LATENCY
+    for name in ("insert", "insert_many", "update"):
+        method = getattr(store, name)
+
+        async def delayed(*args, _method=method, **kwargs):
+            calls.append(1)
+            await asyncio.sleep(STORE_LATENCY)
+            return await _method(*args, **kwargs)
+
+        setattr(store, name, delayed)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {p: samples[min(len(samples) - 1, int(len(samples) * p / 100))] * 1000 for p in (50, 95, 99)}
+
+
+async def measure(batch_size):
+    module = setup_lesson("4- Request_Body", 100)
+    calls = []
+    slow(module.store, calls)
+    app, writes = module.app, module.writes
+    writes.batch_size = batch_size
+
+    accepted, saved, rejected = [], [], 0
+    body = {"name": "book", "description": "x" * 100, "price": 10.5, "tax": 0.14}
+
+    async def client(count):
+        nonlocal rejected
+        for _ in range(count):
+            started = time.perf_counter()
+            status, _, payload = await request(app, "POST", "/items", json_body=body)
+            accepted.append(time.perf_counter() - started)
+            if status != 202:
+                rejected += 1
+                continue
+            ticket = json.loads(payload)["ticket"]
+            while writes.status(ticket)["status"] == "queued":
+                await asyncio.sleep(0.001)
+            saved.append(time.perf_counter() - started)
+
+    async with lifespan(app):
+        started = time.perf_counter()
+        await asyncio.gather(*(client(REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    print(f"batch_size={batch_size}")
+    for label, samples in (("202 returned", accepted), ("write saved", saved)):
+        p = percentiles(samples)
+        print(f"  {label:<14} p50={p[50]:7.2f}ms  p95={p[95]:7.2f}ms  p99={p[99]:7.2f}ms")
+    print(f"  store calls={len(calls)} for {len(saved)} writes, rejected={rejected}, "
+          f"throughput={REQUESTS / elapsed:,.0f} writes/s")
+
+
+async def run():
+    print(f"{REQUESTS:,} POST /items, {CONCURRENCY} concurrent clients, "
+          f"store latency {STORE_LATENCY * 1000:.0f}ms per call\n")
+    for batch_size in (1, 100):
+        await measure(batch_size)
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
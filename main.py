@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from fastapi import FastAPI
+from starlette.routing import Mount
+
+from shared.lessons import LESSONS, load_lesson, url_prefix
+
+# ---------------------------------------------------------
+# All Lessons in One App
+# ---------------------------------------------------------
+"""
+Instead of nine `uvicorn api:app` processes, run every lesson in one:
+
+    uvicorn main:app
+
+Each lesson is mounted under its own prefix (/intro, /query-parameters,
+/nested-models, ...) and is only imported on the first request to that
+prefix. Lessons nobody calls cost no startup time and no memory.
+Docs stay per lesson: /intro/docs, /nested-models/docs, ...
+"""
+
+
+# ---------------------------
+# Lazy Sub-App
+# ---------------------------
+class LazyLesson:
+    """ASGI app that imports a lesson's `api.py` on its first request."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.app = None
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if self.app is None:
+            async with self._lock:  # concurrent first requests import it only once
+                if self.app is None:
+                    await self._load()
+        await self.app(scope, receive, send)
+
+    async def _load(self):
+        lesson_app = load_lesson(self.folder).app
+        # Mounted apps don't get lifespan events, so run the lesson's
+        # startup now and its shutdown together with the main app
+        await lessons_lifespans.enter_async_context(lesson_app.router.lifespan_context(lesson_app))
+        self.app = lesson_app
+
+
+lessons_lifespans = AsyncExitStack()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown every lesson that was loaded
+    await lessons_lifespans.aclose()
+
+
+lazy_lessons = {url_prefix(folder): LazyLesson(folder) for folder in LESSONS}
+
+app = FastAPI(
+    title="Learning FastAPI - all lessons",
+    lifespan=lifespan,
+    routes=[Mount(prefix, app=lesson) for prefix, lesson in lazy_lessons.items()]
+)
+
+
+# ---------------------------
+# Index of Lessons
+# ---------------------------
+@app.get("/")
+async def list_lessons():
+    # Prefix → lesson folder, and whether it has been loaded yet
+    return {
+        prefix: {"lesson": lesson.folder, "loaded": lesson.app is not None, "docs": f"{prefix}/docs"}
+        for prefix, lesson in lazy_lessons.items()
+    }
@@ -0,0 +1,6 @@
+"""
+Reusable building blocks shared by the lesson apps (stores, middleware, ...).
+
+Each lesson is still started from its own folder (`uvicorn api:app`), so the
+lessons that use this package add the repository root to `sys.path` first.
+"""
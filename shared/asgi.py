@@ -0,0 +1,18 @@
+"""
+Small helpers for the plain ASGI middlewares in this package.
+"""
+
+
+def app_path(scope) -> str:
+    """
+    Request path as seen by the app itself.
+
+    When an app is mounted under a prefix (see main.py), `scope["path"]` is
+    the full path ("/query-parameters/items") and `scope["root_path"]` is the
+    prefix; routes and middleware config use the path without the prefix.
+    """
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        return path[len(root_path):] or "/"
+    return path
@@ -0,0 +1,105 @@
+"""
+Compact bitmap of non-negative integers (e.g. user ids), one bit per id.
+
+    admins = Bitmap([1, 5, 42])
+    42 in admins                  # O(1) bit test
+    admins & editors              # set operations on whole bytes, in C
+    list(admins.iter_from(6))     # ids in ascending order, from 6 on
+
+A bitmap over 10 million ids takes 1.25MB, where a `set` of ints costs ~60
+bytes per id. The bits live in a mutable bytearray, so adding or removing
+an id is O(1) (a Python int bitset would copy the whole number on every
+write). Iteration skips empty bytes with a regex scan, so sparse bitmaps
+are walked at C speed.
+"""
+import re
+from collections.abc import Iterable, Iterator
+
+# byte value → offsets of its set bits, e.g. 0b101 → (0, 2)
+_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+# Runs of non-empty bytes, capped so the first ids of a dense bitmap come out right away
+_NONZERO = re.compile(rb"[^\x00]{1,64}")
+
+
+class Bitmap:
+    def __init__(self, ids: Iterable[int] = ()):
+        self._bytes = bytearray()
+        self._count = 0
+        ids = list(ids)
+        if ids:
+            # Bulk load: size the bytearray once, set bits without method calls
+            data = self._bytes = bytearray((max(ids) >> 3) + 1)
+            for value in ids:
+                data[value >> 3] |= 1 << (value & 7)
+            self._count = self._int().bit_count()
+
+    @classmethod
+    def _from_int(cls, bits: int) -> "Bitmap":
+        bitmap = cls()
+        bitmap._bytes = bytearray(bits.to_bytes((bits.bit_length() + 7) // 8, "little"))
+        bitmap._count = bits.bit_count()
+        return bitmap
+
+    def _int(self) -> int:
+        return int.from_bytes(self._bytes, "little")
+
+    # ---------------------------
+    # Single ids: O(1)
+    # ---------------------------
+    def add(self, value: int):
+        index, mask = value >> 3, 1 << (value & 7)
+        if index >= len(self._bytes):
+            self._bytes.extend(bytes(index + 1 - len(self._bytes)))
+        if not self._bytes[index] & mask:
+            self._bytes[index] |= mask
+            self._count += 1
+
+    def discard(self, value: int):
+        index, mask = value >> 3, 1 << (value & 7)
+        if index < len(self._bytes) and self._bytes[index] & mask:
+            self._bytes[index] &= ~mask & 0xFF
+            self._count -= 1
+
+    def __contains__(self, value: int) -> bool:
+        try:
+            return value >= 0 and self._bytes[value >> 3] >> (value & 7) & 1 == 1
+        except IndexError:
+            return False
+
+    def __len__(self):
+        return self._count
+
+    # ---------------------------
+    # Iteration (ascending ids)
+    # ---------------------------
+    def __iter__(self) -> Iterator[int]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int) -> Iterator[int]:
+        """Ids >= start, in ascending order."""
+        start = max(start, 0)
+        data, bits = self._bytes, _BITS
+        for run in _NONZERO.finditer(data, start >> 3):
+            for index in range(run.start(), run.end()):
+                base = index << 3
+                for bit in bits[data[index]]:
+                    if base + bit >= start:
+                        yield base + bit
+
+    # ---------------------------
+    # Set operations: whole bitmaps at once (big-int ops in C)
+    # ---------------------------
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap._from_int(self._int() & other._int())
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap._from_int(self._int() | other._int())
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap._from_int(self._int() & ~other._int())
+
+    def __xor__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap._from_int(self._int() ^ other._int())
+
+    def nbytes(self) -> int:
+        return len(self._bytes)
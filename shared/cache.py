@@ -0,0 +1,168 @@
+"""
+Response cache with ETag / conditional GET support.
+
+Read-only endpoints are cached by route + normalized query parameters (+ the
+Accept header, since it can switch the response format). The whole cache is
+invalidated as soon as the catalog version changes.
+
+    - cache hit                       → stored body, no filtering / encoding
+    - If-None-Match matches the ETag  → 304 Not Modified, no body at all
+    - concurrent misses for one key   → rendered once (single-flight), shared
+"""
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from shared.asgi import app_path
+from shared.singleflight import SingleFlight
+
+
+class ResponseCache:
+    """Bounded LRU of encoded responses for one catalog version."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._version = None
+        self._entries: OrderedDict[tuple, tuple[str, list, bytes]] = OrderedDict()
+
+    def get(self, key: tuple, version) -> tuple[str, list, bytes] | None:
+        if version != self._version:
+            # The catalog changed: every stored response is stale
+            self._entries.clear()
+            self._version = version
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: tuple, version, entry: tuple[str, list, bytes]):
+        if version != self._version:
+            return  # computed against an older catalog, don't keep it
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+class ConditionalGetMiddleware:
+    """
+    ASGI middleware serving cached GET responses for `paths`, with ETags.
+
+    `version` is a callable returning the current catalog version; any write
+    that bumps it invalidates the cache. Only 200 JSON responses are cached
+    (streamed NDJSON responses pass through untouched).
+
+    With `flights`, identical requests that miss the cache at the same time
+    are coalesced: one runs the endpoint, the others reuse its response.
+    """
+
+    def __init__(
+        self,
+        app,
+        cache: ResponseCache,
+        version: Callable[[], int],
+        paths: set[str],
+        flights: SingleFlight | None = None
+    ):
+        self.app = app
+        self.cache = cache
+        self.version = version
+        self.paths = set(paths)
+        self.flights = flights
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        path = app_path(scope)
+        if path not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        key = (
+            path,
+            tuple(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True))),
+            request_headers.get("accept", ""),
+        )
+        version = self.version()
+        entry = self.cache.get(key, version)
+
+        if entry is None:
+            if self.flights is None:
+                entry = await self._render(scope, receive, send)
+            else:
+                entry, shared = await self.flights.do((key, version), lambda: self._render(scope, receive, send))
+                if entry is None and shared:
+                    # The leader's response can't be reused (not cacheable, or it failed)
+                    entry = await self._render(scope, receive, send)
+            if entry is None:
+                return  # not cacheable, already sent to the client
+            self.cache.put(key, version, entry)
+
+        await self._send_entry(entry, request_headers.get("if-none-match"), send)
+
+    async def _render(self, scope, receive, send):
+        """Run the endpoint and buffer a cacheable response (or forward it as is)."""
+        start = None
+        body = []
+        passthrough = False
+
+        async def capture(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                content_type = Headers(raw=message["headers"]).get("content-type", "")
+                if message["status"] == 200 and content_type.startswith("application/json"):
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+            else:
+                body.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        if passthrough or start is None:
+            return None
+
+        payload = b"".join(body)
+        etag = '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+        headers = [(k, v) for k, v in start["headers"] if k != b"content-length"]
+        return etag, headers, payload
+
+    async def _send_entry(self, entry, if_none_match, send):
+        etag, headers, payload = entry
+
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            self.cache.not_modified += 1
+            response_headers = MutableHeaders(raw=[])
+            response_headers["etag"] = etag
+            await send({"type": "http.response.start", "status": 304, "headers": response_headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        response_headers = MutableHeaders(raw=list(headers))
+        response_headers["etag"] = etag
+        response_headers["content-length"] = str(len(payload))
+        await send({"type": "http.response.start", "status": 200, "headers": response_headers.raw})
+        await send({"type": "http.response.body", "body": payload})
@@ -0,0 +1,130 @@
+"""
+Push-based change feed: subscribers get catalog writes as they happen.
+
+    feed = ChangeFeed(history=1000, buffer_size=256)
+    feed.publish("update", item)                     # after every write
+
+    subscription = feed.subscribe(after=last_seen_seq)
+    async for event in subscription:                 # missed events, then live
+        send(event.data)
+
+Every event gets the next sequence number, is encoded to JSON once and goes
+into a ring buffer of the last `history` events shared by all subscribers.
+A subscriber is just a position in that ring, so publishing costs the same
+with 10 or 10,000 subscribers: the event is stored, and one future wakes
+every subscriber waiting for it.
+
+A client that reconnects passes the last sequence number it saw and reads
+on from there; if those events already left the ring it gets a "reset"
+event (reload the listing, then follow the feed). A subscriber more than
+`buffer_size` events behind is dropped: it gets a "dropped" event carrying
+the sequence number to resume from, and its iteration ends.
+"""
+import asyncio
+import json
+from typing import NamedTuple
+
+CREATE, UPDATE, STOCK, RESET, DROPPED = "create", "update", "stock", "reset", "dropped"
+
+
+class Event(NamedTuple):
+    seq: int
+    type: str
+    data: str  # JSON: {"seq": ..., "type": ..., "item": {...}}
+
+
+class ChangeFeed:
+    def __init__(self, history: int = 1000, buffer_size: int = 256):
+        if not 0 < buffer_size <= history:
+            raise ValueError("buffer_size must be between 1 and history")
+        self.history = history
+        self.buffer_size = buffer_size
+        self.seq = 0
+        self.dropped = 0
+        self._ring: list[Event | None] = [None] * history  # event `seq` at seq % history
+        self._subscribers: set[Subscription] = set()
+        self._waiter: asyncio.Future | None = None
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def publish(self, kind: str, item: dict) -> Event:
+        self.seq += 1
+        event = Event(self.seq, kind, self._encode({"seq": self.seq, "type": kind, "item": item}))
+        self._ring[self.seq % self.history] = event
+        # One future for all the waiting subscribers, however many there are
+        if self._waiter is not None:
+            self._waiter.set_result(None)
+            self._waiter = None
+        return event
+
+    def subscribe(self, after: int | None = None) -> "Subscription":
+        """
+        Live events from now on, preceded by the missed ones when `after`
+        (the last sequence number the client saw) is given.
+        """
+        subscription = Subscription(self, self.seq if after is None else after)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: "Subscription"):
+        self._subscribers.discard(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "seq": self.seq,
+            "subscribers": len(self._subscribers),
+            "dropped": self.dropped,
+            "history": min(self.seq, self.history),
+            "buffer_size": self.buffer_size,
+        }
+
+    def _in_history(self, after: int) -> bool:
+        # Every event after `after` is still in the ring (a larger seq than
+        # ours comes from before a restart: its events are gone too)
+        return max(0, self.seq - self.history) <= after <= self.seq
+
+    def _control(self, kind: str, seq: int) -> Event:
+        return Event(seq, kind, self._encode({"seq": seq, "type": kind}))
+
+    async def _wait(self):
+        if self._waiter is None:
+            self._waiter = asyncio.get_running_loop().create_future()
+        # Shielded: a subscriber that is cancelled must not cancel the others' wait
+        await asyncio.shield(self._waiter)
+
+
+class Subscription:
+    """Async iterator of `Event`s for one subscriber."""
+
+    def __init__(self, feed: ChangeFeed, after: int):
+        self.feed = feed
+        self.dropped = False
+        self._reset = not feed._in_history(after)
+        self.last_seq = feed.seq if self._reset else after  # the client's resume point
+        self._joined = feed.seq  # missed events replayed on (re)connect don't count as lag
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        feed = self.feed
+        if self.dropped:
+            raise StopAsyncIteration
+        if self._reset:
+            self._reset = False
+            return feed._control(RESET, self.last_seq)
+
+        while self.last_seq == feed.seq:
+            await feed._wait()
+
+        if feed.seq - max(self.last_seq, self._joined) > feed.buffer_size or feed.seq - self.last_seq > feed.history:
+            # Too slow: stop here rather than fall further behind
+            self.dropped = True
+            feed.dropped += 1
+            self.close()
+            return feed._control(DROPPED, self.last_seq)
+
+        self.last_seq += 1
+        return feed._ring[self.last_seq % feed.history]
+
+    def close(self):
+        self.feed.unsubscribe(self)
@@ -0,0 +1,274 @@
+"""
+Columnar item catalog backed by NumPy arrays.
+
+Optional storage engine for analytics-style queries over millions of items:
+ids, prices and stock flags live in NumPy arrays, filters are evaluated as
+boolean masks, and only the selected rows are turned back into dicts.
+It exposes the same methods as `ItemStore`, so the lessons can switch engines.
+"""
+try:
+    import numpy as np
+except ImportError as exc:  # numpy is optional, only this engine needs it
+    raise ImportError("The columnar catalog needs NumPy: pip install numpy") from exc
+
+from shared.search import NameIndex, search_items
+from shared.store import BATCH_SIZE
+
+
+class ColumnarStore:
+    """
+    Item catalog stored column by column.
+
+    - ids, prices, stock → NumPy arrays (vectorized filters)
+    - names              → int codes in a NumPy array + a code table
+    - alive              → mask of rows that have not been deleted
+    - id order           → alive rows sorted by id, with their ids (offset and
+                           keyset pages: a slice after one searchsorted)
+    - search             → NameIndex of the names of alive rows (typeahead)
+
+    Arrays grow by doubling, so appending a row is amortized O(1); keeping
+    the id order costs a memmove when an id lands before the largest one.
+    Every write bumps `version`, like `ItemStore`.
+    """
+
+    def __init__(self, items=(), capacity: int = 1024):
+        items = list(items)
+        capacity = max(capacity, len(items))
+        self.version = 0
+        self._size = 0
+        self._row_of: dict[int, int] = {}
+        self._name_codes: dict[str, int] = {}
+        self._names: list[str] = []  # code → name
+        self._search = NameIndex()
+
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._stock = np.zeros(capacity, dtype=np.bool_)
+        self._codes = np.zeros(capacity, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=np.bool_)
+        self._order = np.zeros(capacity, dtype=np.int64)  # first len(self) entries: alive rows by id
+        self._order_ids = np.zeros(capacity, dtype=np.int64)  # their ids, for searchsorted
+
+        self._load(items)
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __iter__(self):
+        return iter(self._rows(np.flatnonzero(self._alive[:self._size])))
+
+    def __contains__(self, item_id):
+        return item_id in self._row_of
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def get(self, item_id: int) -> dict | None:
+        row = self._row_of.get(item_id)
+        return None if row is None else self._rows([row])[0]
+
+    def find_by_name(self, name: str) -> list[dict]:
+        code = self._name_codes.get(name)
+        if code is None:
+            return []
+        return self._select(self._codes[:self._size] == code)
+
+    def search(self, query: str, substring: bool = False, limit: int = 10) -> list[dict]:
+        """Up to `limit` items whose name starts with (or contains) `query`."""
+        return search_items(self._search, self.find_by_name, query, substring, limit)
+
+    def by_price(
+        self,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        start: int = 0,
+        limit: int | None = None
+    ) -> list[dict]:
+        """Items with min_price <= price <= max_price, most expensive first (`start` / `limit` page)."""
+        start = max(start, 0)
+        end = None if limit is None else start + max(limit, 0)
+        return self._rows(self._price_rows(min_price, max_price)[start:end])
+
+    def count_by_price(self, min_price: float | None = None, max_price: float | None = None) -> int:
+        return int(np.count_nonzero(self._price_mask(min_price, max_price)))
+
+    def in_stock(self, flag: bool = True) -> list[dict]:
+        stock = self._stock[:self._size]
+        return self._select(stock if flag else ~stock)
+
+    def page(self, start: int = 0, size: int = 10) -> list[dict]:
+        """Offset pagination (ordered by id), with list slice semantics: items[start:start + size]."""
+        return self._rows(self._id_order()[start:start + size])
+
+    def page_after(self, after_id: int | None = None, limit: int = 10) -> tuple[list[dict], int | None]:
+        """Keyset pagination: up to `limit` items with id > after_id."""
+        if limit <= 0:
+            return [], None
+        rows = self._id_order()
+        start = 0 if after_id is None else int(np.searchsorted(self._order_ids[:len(rows)], after_id, side="right"))
+        page = self._rows(rows[start:start + limit])
+        has_more = start + limit < len(rows)
+        return page, (page[-1]["id"] if has_more else None)
+
+    # ---------------------------
+    # Lazy listings (streaming)
+    # ---------------------------
+    # The row numbers are selected up front (vectorized), the dicts are only
+    # built BATCH_SIZE rows at a time while the response is being sent
+    def iter_by_name(self, name: str):
+        code = self._name_codes.get(name)
+        if code is None:
+            return iter(())
+        return self._iter_rows(np.flatnonzero((self._codes[:self._size] == code) & self._alive[:self._size]))
+
+    def iter_by_price(self, min_price: float | None = None, max_price: float | None = None):
+        return self._iter_rows(self._price_rows(min_price, max_price))
+
+    def iter_in_stock(self, flag: bool = True):
+        stock = self._stock[:self._size]
+        return self._iter_rows(np.flatnonzero((stock if flag else ~stock) & self._alive[:self._size]))
+
+    def iter_page(self, start: int = 0, size: int = 10):
+        # A copy: inserts and deletes shift the id order in place
+        return self._iter_rows(self._id_order()[start:start + size].copy())
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def insert(self, item: dict) -> dict:
+        """Insert one item; an item without "id" gets the next free id."""
+        count = len(self._row_of)
+        if "id" not in item:
+            # Largest id + 1, read from the end of the id order: O(1)
+            item = {"id": int(self._order_ids[count - 1]) + 1 if count else 1, **item}
+        item_id = item["id"]
+        if item_id in self._row_of:
+            raise KeyError(f"Item {item_id} already exists")
+        self.version += 1
+        if self._size == len(self._ids):
+            self._grow()
+
+        row = self._size
+        self._size += 1
+        self._row_of[item_id] = row
+        self._ids[row] = item_id
+        self._alive[row] = True
+        self._write(row, item)
+        self._search.add(item["name"])
+
+        # New ids are usually the largest: then this is an append
+        pos = int(np.searchsorted(self._order_ids[:count], item_id))
+        self._order[pos + 1:count + 1] = self._order[pos:count]
+        self._order_ids[pos + 1:count + 1] = self._order_ids[pos:count]
+        self._order[pos] = row
+        self._order_ids[pos] = item_id
+        return item
+
+    def update(self, item_id: int, **changes) -> dict:
+        row = self._row_of[item_id]
+        if "id" in changes and changes["id"] != item_id:
+            raise ValueError("The id of an item cannot be changed")
+        self.version += 1
+
+        item = self._rows([row])[0]
+        old_name = item["name"]
+        item.update(changes)
+        self._write(row, item)
+        self._search.rename(old_name, item["name"])
+        return item
+
+    def delete(self, item_id: int) -> dict:
+        row = self._row_of.pop(item_id)
+        self.version += 1
+        item = self._rows([row])[0]
+        self._alive[row] = False
+        self._search.remove(item["name"])
+
+        count = len(self._row_of)  # after the pop
+        pos = int(np.searchsorted(self._order_ids[:count + 1], item_id))
+        self._order[pos:count] = self._order[pos + 1:count + 1]
+        self._order_ids[pos:count] = self._order_ids[pos + 1:count + 1]
+        return item
+
+    # ---------------------------
+    # Helpers
+    # ---------------------------
+    def _load(self, items: list[dict]):
+        # Bulk load: fill each column in one go instead of row by row
+        n = len(items)
+        self._row_of = {item["id"]: row for row, item in enumerate(items)}
+        if len(self._row_of) != n:
+            raise KeyError("Duplicate item ids")
+        for name in dict.fromkeys(item["name"] for item in items):
+            self._name_codes[name] = len(self._names)
+            self._names.append(name)
+
+        self._ids[:n] = [item["id"] for item in items]
+        self._prices[:n] = [item["price"] for item in items]
+        self._stock[:n] = [item["stock"] for item in items]
+        self._codes[:n] = [self._name_codes[item["name"]] for item in items]
+        self._alive[:n] = True
+        self._size = n
+        order = np.argsort(self._ids[:n], kind="stable")
+        self._order[:n] = order
+        self._order_ids[:n] = self._ids[order]
+        self._search = NameIndex(item["name"] for item in items)
+
+    def _write(self, row: int, item: dict):
+        name = item["name"]
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self._names)
+            self._names.append(name)
+
+        self._prices[row] = item["price"]
+        self._stock[row] = item["stock"]
+        self._codes[row] = code
+
+    def _grow(self):
+        capacity = max(2 * len(self._ids), 1)
+        for column in ("_ids", "_prices", "_stock", "_codes", "_alive", "_order", "_order_ids"):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, column, new)
+
+    def _price_mask(self, min_price: float | None, max_price: float | None):
+        prices = self._prices[:self._size]
+        mask = self._alive[:self._size].copy()
+        if min_price is not None:
+            mask &= prices >= min_price
+        if max_price is not None:
+            mask &= prices <= max_price
+        return mask
+
+    def _price_rows(self, min_price: float | None, max_price: float | None):
+        rows = np.flatnonzero(self._price_mask(min_price, max_price))
+        # Sort only the selected rows: price descending, then id ascending
+        return rows[np.lexsort((self._ids[rows], -self._prices[rows]))]
+
+    def _id_order(self):
+        return self._order[:len(self._row_of)]
+
+    def _select(self, mask) -> list[dict]:
+        return self._rows(np.flatnonzero(mask & self._alive[:self._size]))
+
+    def _iter_rows(self, rows):
+        # Rows are never moved or reused: the selection stays valid while
+        # writes happen, but rows deleted since then are skipped
+        for i in range(0, len(rows), BATCH_SIZE):
+            batch = rows[i:i + BATCH_SIZE]
+            yield from self._rows(batch[self._alive[batch]])
+
+    def _rows(self, rows) -> list[dict]:
+        # Convert whole columns with tolist() instead of element by element
+        names = self._names
+        return [
+            {"id": item_id, "name": names[code], "price": price, "stock": stock}
+            for item_id, code, price, stock in zip(
+                self._ids[rows].tolist(),
+                self._codes[rows].tolist(),
+                self._prices[rows].tolist(),
+                self._stock[rows].tolist(),
+            )
+        ]
@@ -0,0 +1,249 @@
+"""
+Adaptive gzip compression for large responses.
+
+    compression = AdaptiveGzip(minimum_size=1024)
+    app.add_middleware(GzipMiddleware, gzip=compression)
+
+Only responses of at least `minimum_size` bytes, with a compressible content
+type, are compressed, and only for clients sending `Accept-Encoding: gzip`.
+The level is picked per response:
+
+    - by size: small bodies get a high level (cheap anyway), multi-MB bodies
+      a low one, so one response can't hold the event loop for long
+    - by CPU headroom: when the process is already busy, the level drops
+      (down to 1) to spend the CPU on requests instead of on compression
+
+Streaming responses (e.g. NDJSON) are compressed chunk by chunk with a
+sync flush, so every chunk still reaches the client right away.
+"""
+import time
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+# Content types worth compressing (images, archives, ... are already compressed)
+COMPRESSIBLE = ("application/json", "application/x-ndjson", "application/javascript", "text/")
+# ... except server-sent events: buffering up to `minimum_size` would hold events back
+NEVER_COMPRESSED = ("text/event-stream",)
+
+# (largest body size, level) by size; bigger bodies get a lower level
+LEVELS_BY_SIZE = ((64 * 1024, 6), (1024 * 1024, 4), (float("inf"), 1))
+
+# Streamed bodies have no known size: they are large listings, level as for 1MB
+STREAMED_SIZE = 1024 * 1024
+
+
+class AdaptiveGzip:
+    """Compression settings, CPU load estimate and counters for one app."""
+
+    def __init__(self, minimum_size: int = 1024, busy: float = 0.5, saturated: float = 0.85,
+                 sample_interval: float = 0.5):
+        self.minimum_size = minimum_size
+        self.busy = busy  # CPU share of this process above which the level drops by 2
+        self.saturated = saturated  # ... above which it drops to 1
+        self.sample_interval = sample_interval
+        self.compressed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.levels: dict[int, int] = {}
+        self._cpu_load = 0.0
+        self._sampled_at = (time.monotonic(), time.process_time())
+
+    def cpu_load(self) -> float:
+        """Share of one CPU used by this process over the last sample interval."""
+        wall, cpu = time.monotonic(), time.process_time()
+        last_wall, last_cpu = self._sampled_at
+        if wall - last_wall >= self.sample_interval:
+            self._cpu_load = min(1.0, (cpu - last_cpu) / (wall - last_wall))
+            self._sampled_at = (wall, cpu)
+        return self._cpu_load
+
+    def level(self, size: int | None) -> int:
+        """Level for a body of `size` bytes (None: streamed, size unknown)."""
+        if size is None:
+            size = STREAMED_SIZE
+        level = next(level for limit, level in LEVELS_BY_SIZE if size <= limit)
+        load = self.cpu_load()
+        if load >= self.saturated:
+            return 1
+        if load >= self.busy:
+            return max(1, level - 2)
+        return level
+
+    def record(self, level: int, size_in: int, size_out: int):
+        self.compressed += 1
+        self.bytes_in += size_in
+        self.bytes_out += size_out
+        self.levels[level] = self.levels.get(level, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "minimum_size": self.minimum_size,
+            "compressed": self.compressed,
+            "skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            "cpu_load": round(self._cpu_load, 3),
+            "levels": self.levels,
+        }
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    # "gzip", "gzip;q=0.8", "*" ... but not "gzip;q=0"
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() in ("gzip", "*"):
+            quality = params.strip().removeprefix("q=")
+            try:
+                return float(quality) > 0 if quality else True
+            except ValueError:
+                return True
+    return False
+
+
+class GzipMiddleware:
+    """
+    ASGI middleware compressing responses with the levels from `gzip`.
+
+    Bodies are buffered until `minimum_size` bytes have been produced (or the
+    response ended), so small streamed responses stay uncompressed too.
+    ETags get a "-gzip" suffix (the compressed bytes differ), and the suffix
+    is removed from If-None-Match before it reaches the app, so a conditional
+    GET still gets its 304. A 304 only gets the suffix back when the client
+    validated a "-gzip" tag: a body sent uncompressed (below `minimum_size`)
+    keeps its plain ETag on revalidation too.
+    """
+
+    def __init__(self, app, gzip: AdaptiveGzip):
+        self.app = app
+        self.gzip = gzip
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not accepts_gzip(headers.get("accept-encoding", "")):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = headers.get("if-none-match")
+        holds_gzip = bool(if_none_match) and '-gzip"' in if_none_match
+        if holds_gzip:
+            scope = dict(scope)
+            request_headers = MutableHeaders(scope=scope)
+            request_headers["if-none-match"] = if_none_match.replace('-gzip"', '"')
+
+        await self.app(scope, receive, _GzipResponder(self.gzip, send, holds_gzip).send)
+
+
+class _GzipResponder:
+    """Per-response state: undecided (buffering) → compressing or passthrough."""
+
+    def __init__(self, gzip: AdaptiveGzip, send, holds_gzip: bool = False):
+        self.gzip = gzip
+        self._send = send
+        self.holds_gzip = holds_gzip  # the client's If-None-Match names the gzipped representation
+        self.start = None
+        self.buffer = []
+        self.buffered = 0
+        self.passthrough = False
+        self.compressor = None
+        self.level = 0
+        self.size_in = 0
+        self.size_out = 0
+
+    async def send(self, message):
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            response_headers = Headers(raw=message["headers"])
+            length = response_headers.get("content-length")
+            if (
+                "content-encoding" in response_headers
+                or not response_headers.get("content-type", "").startswith(COMPRESSIBLE)
+                or response_headers.get("content-type", "").startswith(NEVER_COMPRESSED)
+                or (length is not None and int(length) < self.gzip.minimum_size)
+            ):
+                self.gzip.skipped += 1
+                self.passthrough = True
+                if message["status"] == 304 and self.holds_gzip:
+                    message = _gzip_etag(message)  # keep the tag the client validated
+                await self._send(message)
+                return
+            self.start = message  # sent once we know whether to compress
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            await self._send_compressed(body, more_body)
+            return
+
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if self.buffered < self.gzip.minimum_size:
+            if more_body:
+                return  # keep buffering until the threshold is reached
+            # Ended below the threshold: send it as is
+            self.gzip.skipped += 1
+            self.passthrough = True
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": b"".join(self.buffer)})
+            return
+
+        # Known size for single-message bodies; streamed ones count as STREAMED_SIZE
+        self.level = self.gzip.level(None if more_body else self.buffered)
+        # wbits=31 → gzip container (header + CRC) instead of a raw zlib stream
+        self.compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+        response_headers = MutableHeaders(raw=list(self.start["headers"]))
+        del response_headers["content-length"]
+        response_headers["content-encoding"] = "gzip"
+        response_headers.add_vary_header("Accept-Encoding")
+        _add_etag_suffix(response_headers)
+
+        payload = b"".join(self.buffer)
+        self.buffer = []
+        if not more_body:
+            # Whole body at once: compress it and send a Content-Length
+            compressed = self.compressor.compress(payload) + self.compressor.flush()
+            response_headers["content-length"] = str(len(compressed))
+            self.gzip.record(self.level, len(payload), len(compressed))
+            await self._send({**self.start, "headers": response_headers.raw})
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        await self._send({**self.start, "headers": response_headers.raw})
+        await self._send_compressed(payload, more_body)
+
+    async def _send_compressed(self, body: bytes, more_body: bool):
+        chunk = self.compressor.compress(body)
+        # Sync flush: the client can decode this chunk now, without waiting for the rest
+        chunk += self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        self.size_in += len(body)
+        self.size_out += len(chunk)
+        if not more_body:
+            self.gzip.record(self.level, self.size_in, self.size_out)
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+def _add_etag_suffix(headers: MutableHeaders):
+    etag = headers.get("etag")
+    if etag and etag.endswith('"'):
+        headers["etag"] = etag[:-1] + '-gzip"'
+
+
+def _gzip_etag(message: dict) -> dict:
+    headers = MutableHeaders(raw=list(message["headers"]))
+    _add_etag_suffix(headers)
+    return {**message, "headers": headers.raw}
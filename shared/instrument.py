@@ -0,0 +1,39 @@
+"""
+Observability and docs wiring shared by every lesson app.
+
+    app = FastAPI()
+    app.add_middleware(...)                # the lesson's own middlewares first
+    profiler = instrument(app, __file__)   # then metrics + profiling around them
+
+For the lesson whose `api.py` is `lesson_file`, it adds:
+    - MetricsMiddleware: request count / latency / errors per route,
+      served at /metrics
+    - opt-in cProfile of single requests (X-Profile header or a sampling
+      rate), only when PROFILE_DIR is set; the profiles are listed at
+      /profiles (see `shared.profiling.enable_profiling`)
+    - the OpenAPI schema built ahead of time (`python -m shared.openapi`),
+      loaded from <lesson folder>/openapi.json at startup instead of being
+      generated on the first /docs hit in every worker
+
+Call it after the lesson's own `add_middleware` calls: the last middleware
+added is the outermost one, so metrics and profiles then cover the whole
+stack (admission rejections and cache hits included).
+"""
+import os
+
+from shared.lessons import url_prefix
+from shared.metrics import MetricsMiddleware
+from shared.openapi import use_precomputed_openapi
+from shared.profiling import Profiler, enable_profiling
+
+
+def instrument(app, lesson_file: str) -> Profiler | None:
+    """Wire metrics, profiling and the stored OpenAPI schema into `app`."""
+    lesson_dir = os.path.dirname(os.path.abspath(lesson_file))
+    # "3- Query_Parameters" → "query-parameters" (the profiles' subdirectory)
+    name = url_prefix(os.path.basename(lesson_dir)).lstrip("/")
+
+    app.add_middleware(MetricsMiddleware, routes=app.routes)
+    profiler = enable_profiling(app, name)
+    use_precomputed_openapi(app, os.path.join(lesson_dir, "openapi.json"))
+    return profiler
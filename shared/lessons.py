@@ -0,0 +1,58 @@
+"""
+Load the lesson apps (`<folder>/api.py`) as regular Python modules.
+
+The lesson folders ("3- Query_Parameters", ...) are not valid package names,
+so each `api.py` is loaded from its file path under a unique module name.
+Helper modules a lesson imports from its own folder are dropped from
+`sys.modules` afterwards, so two lessons can have helpers with the same name.
+"""
+import importlib.util
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LESSONS = (
+    "1- Intro",
+    "2- Path_Parameters",
+    "3- Query_Parameters",
+    "4- Request_Body",
+    "5- String_Validation",
+    "6- Numeric_Validation",
+    "7- Body_Multiple_Parameters",
+    "8- Fields",
+    "9- Nested_Models",
+)
+
+
+def url_prefix(folder: str) -> str:
+    # "9- Nested_Models" → "/nested-models"
+    return "/" + folder.split("- ", 1)[1].lower().replace("_", "-")
+
+
+def module_name(folder: str) -> str:
+    # "3- Query_Parameters" → "lesson_3_query_parameters"
+    return "lesson_" + re.sub(r"\W+", "_", folder).strip("_").lower()
+
+
+def load_lesson(folder: str) -> ModuleType:
+    """Import `<folder>/api.py` (a fresh copy on every call)."""
+    lesson_dir = ROOT / folder
+    name = module_name(folder)
+    spec = importlib.util.spec_from_file_location(name, lesson_dir / "api.py")
+    module = importlib.util.module_from_spec(spec)
+
+    before = set(sys.modules)
+    sys.modules[name] = module  # pydantic looks models' modules up here
+    sys.path.insert(0, str(lesson_dir))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(lesson_dir))
+        for added in set(sys.modules) - before - {name}:
+            path = getattr(sys.modules[added], "__file__", None) or ""
+            if Path(path).resolve().parent == lesson_dir:
+                del sys.modules[added]
+    return module
@@ -0,0 +1,149 @@
+"""
+Per-route request metrics, exposed in Prometheus text format at /metrics.
+
+    app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+Recorded per (method, route template), e.g. ("GET", "/items/{item_id}"):
+    - http_requests_total{status=...}       request count
+    - http_request_errors_total             5xx responses + unhandled exceptions
+    - http_request_duration_seconds         latency histogram
+    - http_requests_in_flight               requests currently being handled
+
+Labels use the route template, never the raw path, so the number of series
+stays bounded. Per request the middleware only does a couple of dict lookups
+and one bisect, so it is cheap enough to leave on.
+"""
+import time
+from bisect import bisect_left
+
+from starlette.routing import Match
+
+from shared.asgi import app_path
+
+# Histogram upper bounds (seconds); the last bucket is +Inf
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+UNMATCHED = "<unmatched>"
+
+
+class Metrics:
+    """In-process metric registry for one app."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, int], int] = {}
+        self.errors: dict[tuple[str, str], int] = {}
+        # (method, route) → [bucket counts..., +Inf count, sum of durations]
+        self.latency: dict[tuple[str, str], list] = {}
+
+    def observe(self, method: str, route: str, status: int, duration: float):
+        key = (method, route, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        if status >= 500:
+            self.errors[method, route] = self.errors.get((method, route), 0) + 1
+
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[method, route] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, duration)] += 1
+        histogram[-1] += duration
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Handled requests.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_errors_total Requests that ended in a 5xx or an exception.",
+            "# TYPE http_request_errors_total counter",
+        ]
+        for (method, route), count in sorted(self.errors.items()):
+            lines.append(f'http_request_errors_total{{method="{method}",route="{_escape(route)}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), histogram[:-1]):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram[-1]}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording `Metrics` and serving them at `path`.
+
+    `routes` (the app's route list) is only used to label requests that
+    never reached the router, e.g. responses served by a cache middleware.
+    """
+
+    def __init__(self, app, routes=(), path: str = "/metrics", metrics: Metrics | None = None):
+        self.app = app
+        self.routes = routes
+        self.path = path
+        self.metrics = metrics or Metrics()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if app_path(scope) == self.path:
+            await self._serve_metrics(send)
+            return
+
+        metrics = self.metrics
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            metrics.in_flight -= 1
+            metrics.observe(scope["method"], self._route_template(scope), status, duration)
+
+    def _route_template(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        for candidate in self.routes:
+            if candidate.matches(scope)[0] == Match.FULL:
+                return candidate.path
+        return UNMATCHED
+
+    async def _serve_metrics(self, send):
+        body = self.metrics.render().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
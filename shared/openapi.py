@@ -0,0 +1,181 @@
+"""
+Precomputed OpenAPI schema, stored on disk and loaded at startup.
+
+FastAPI builds the schema on the first /docs or /openapi.json request, in
+every worker, after every restart. For heavily annotated models that first
+request is slow. Instead:
+
+    python -m shared.openapi            # build step: write <lesson>/openapi.json
+    python -m shared.openapi --check    # exit 1 if any stored schema is stale
+
+    use_precomputed_openapi(app, path)  # in api.py: load it at startup
+
+The stored file carries a hash of the route table (paths, methods,
+parameters, models, the source of the modules defining the endpoints and
+every model / enum they use, and the FastAPI / pydantic versions). A schema
+whose hash does not match the running app is never served: the app falls
+back to generating it as usual.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import typing
+from contextlib import asynccontextmanager
+from enum import Enum
+
+import fastapi
+import pydantic
+from fastapi.dependencies.utils import get_flat_params
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+# "<function f at 0x7f...>" → "<function f>": addresses change on every run
+ADDRESS = re.compile(r" at 0x[0-9a-f]+")
+
+
+def route_table_hash(app) -> str:
+    """Fingerprint of everything the generated schema depends on."""
+    table = [(
+        fastapi.__version__, pydantic.VERSION, app.openapi_version, app.title, app.version,
+        app.summary, app.description, app.openapi_tags,
+    )]
+    modules = set()
+    for route in app.routes:
+        table.append((
+            type(route).__name__, route.path, sorted(getattr(route, "methods", None) or ()),
+            getattr(route, "name", None), getattr(route, "include_in_schema", None),
+        ))
+        if isinstance(route, APIRoute):
+            table.append((
+                route.response_model, route.status_code, route.tags, route.summary, route.description,
+                route.deprecated, route.responses, route.operation_id,
+                route.body_field and route.body_field.field_info,
+                [(param.name, param.field_info) for param in get_flat_params(route.dependant)],
+            ))
+            modules.add(route.endpoint.__module__)
+            # ... and of every model / enum in the schema, wherever it is defined
+            # (e.g. WriteTicket in shared/write_behind.py)
+            annotations = [route.response_model] + [
+                param.field_info.annotation for param in route.dependant.body_params + get_flat_params(route.dependant)
+            ]
+            modules.update(_model_modules(annotations))
+
+    text = ADDRESS.sub("", repr(table))
+    for name in modules:
+        # Same app, different module name: "api" under uvicorn, "lesson_9_..." in the build step
+        text = text.replace(f"'{name}.", "'")
+    digest = hashlib.blake2b(text.encode(), digest_size=16)
+
+    # Model fields / constraints live in the source, not in the route table
+    for name in sorted(modules):
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if path and os.path.exists(path):
+            with open(path, "rb") as source:
+                digest.update(source.read())
+    return digest.hexdigest()
+
+
+def _model_modules(annotations) -> set[str]:
+    """Modules defining the models / enums in `annotations`, nested fields included."""
+    modules, seen, pending = set(), set(), list(annotations)
+    while pending:
+        annotation = pending.pop()
+        if isinstance(annotation, type) and issubclass(annotation, (BaseModel, Enum)):
+            if annotation in seen:
+                continue
+            seen.add(annotation)
+            modules.add(annotation.__module__)
+            if issubclass(annotation, BaseModel):
+                pending.extend(field.annotation for field in annotation.model_fields.values())
+        else:
+            # list[Item], Item | None, Annotated[Item, ...] ...
+            pending.extend(typing.get_args(annotation))
+    return modules
+
+
+def load_schema(app, path: str) -> dict | None:
+    """The schema stored at `path`, or None if missing or built for other routes."""
+    try:
+        with open(path, encoding="utf-8") as stored_file:
+            stored = json.load(stored_file)
+    except (OSError, ValueError):
+        return None
+    if stored.get("route_hash") != route_table_hash(app):
+        return None  # stale: the routes / models changed since the build
+    return stored["schema"]
+
+
+def write_schema(app, path: str):
+    """Generate the app's schema and store it at `path` (atomic replace)."""
+    app.openapi_schema = None
+    stored = {"route_hash": route_table_hash(app), "schema": app.openapi()}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as stored_file:
+        json.dump(stored, stored_file)
+    os.replace(tmp_path, path)
+
+
+def use_precomputed_openapi(app, path: str):
+    """
+    Load the schema stored at `path` when the app starts up.
+
+    Routes are only complete once the whole module ran, so the schema is
+    loaded from the app's lifespan (startup), not at the call site.
+    """
+    app.state.openapi_path = path
+    app.state.openapi_precomputed = False
+    generate = app.openapi
+    lifespan = app.router.lifespan_context
+
+    def openapi():
+        if app.openapi_schema is None:
+            app.openapi_schema = generate()
+        if app.servers:
+            # e.g. the root_path of a mounted app, added per request by FastAPI
+            app.openapi_schema["servers"] = app.servers
+        return app.openapi_schema
+
+    @asynccontextmanager
+    async def lifespan_with_schema(lifespan_app):
+        if app.openapi_schema is None:
+            app.openapi_schema = load_schema(app, path)
+            app.state.openapi_precomputed = app.openapi_schema is not None
+        async with lifespan(lifespan_app) as state:
+            yield state
+
+    app.openapi = openapi
+    app.router.lifespan_context = lifespan_with_schema
+
+
+# ---------------------------
+# Build Step
+# ---------------------------
+def main():
+    from shared.lessons import LESSONS, load_lesson
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only report stale / missing schemas")
+    args = parser.parse_args()
+
+    stale = 0
+    for folder in LESSONS:
+        app = load_lesson(folder).app
+        path = getattr(app.state, "openapi_path", None)
+        if path is None:
+            continue  # lesson doesn't use a precomputed schema
+        if args.check:
+            ok = load_schema(app, path) is not None
+            stale += not ok
+            print(f"{folder:<28} {'ok' if ok else 'STALE'}")
+        else:
+            write_schema(app, path)
+            print(f"{folder:<28} → {os.path.relpath(path)}")
+    if stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+On-demand profiling of single requests with cProfile.
+
+    profiler = Profiler("/tmp/profiles", sample_rate=0.001, keep=50)
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)  # last, so it wraps everything
+
+A request is profiled when it carries `X-Profile: 1` (or `X-Profile: <token>`
+when the profiler has a token), and a `sample_rate` share of all requests
+is profiled at random. The profile covers everything below the middleware
+(request validation, the handler, response serialization, the other
+middlewares) and is saved as a pstats file:
+
+    python -m pstats <file>            # sort / print the stats in a shell
+    snakeviz <file>                    # icicle / sunburst view in a browser
+    flameprof <file> > flame.svg       # flame graph
+
+Only the newest `keep` files are kept, so the directory works as a ring
+buffer on disk. GET /profiles lists them (newest first) and
+GET /profiles/<name> downloads one.
+
+A request that is not profiled costs a scan of its headers (plus one
+random() call when sampling): cProfile is only switched on for the
+requests being profiled. cProfile follows the event loop thread, not one
+request: requests running at the same time as a profiled one show up in
+its profile, while sync `def` endpoints (run in the thread pool) don't.
+One request at a time is profiled per process.
+"""
+import cProfile
+import json
+import os
+import random
+import re
+import time
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+from shared.asgi import app_path
+
+HEADER = b"x-profile"
+SUFFIX = ".pstats"
+
+# "<unix ms>-<pid>-<METHOD>-<status>-<duration µs>-<path>.pstats"
+# ("/" in the path is stored as "+")
+NAME = re.compile(r"(\d+)-(\d+)-([A-Z]+)-(\d+)-(\d+)-([\w.+]*)\.pstats")
+
+
+class Profiler:
+    """Trigger rules, output directory and counters for one app."""
+
+    def __init__(self, directory: str | os.PathLike, sample_rate: float = 0.0, keep: int = 50, token: str = "1"):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.token = token.encode()
+        self.active = False
+        self.profiled = 0
+        self.skipped_busy = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def triggered(self, scope) -> bool:
+        for key, value in scope["headers"]:
+            if key == HEADER:
+                return value == self.token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def save(self, profile: cProfile.Profile, method: str, path: str, status: int, duration: float) -> Path:
+        slug = re.sub(r"[^\w.+]", "_", path.strip("/").replace("/", "+"))[:80]
+        name = f"{time.time_ns() // 1_000_000}-{os.getpid()}-{method}-{status}-{round(duration * 1e6)}-{slug}{SUFFIX}"
+        file = self.directory / name
+        profile.dump_stats(file)
+        # Ring buffer: drop the oldest files (names start with the time)
+        for old in sorted(self.directory.glob("*" + SUFFIX))[:-self.keep]:
+            old.unlink(missing_ok=True)  # another worker may have removed it already
+        return file
+
+    def profiles(self) -> list[dict]:
+        """The stored profiles, newest first."""
+        profiles = []
+        for file in sorted(self.directory.glob("*" + SUFFIX), reverse=True):
+            match = NAME.fullmatch(file.name)
+            if match is None:
+                continue
+            created, pid, method, status, duration, path = match.groups()
+            try:
+                size = file.stat().st_size
+            except FileNotFoundError:
+                continue
+            profiles.append({
+                "name": file.name,
+                "created": int(created) / 1000,
+                "pid": int(pid),
+                "method": method,
+                "path": "/" + path.replace("+", "/"),
+                "status": int(status),
+                "duration_ms": int(duration) / 1000,
+                "size": size,
+            })
+        return profiles
+
+    def stats(self) -> dict:
+        return {
+            "profiled": self.profiled,
+            "skipped_busy": self.skipped_busy,
+            "sample_rate": self.sample_rate,
+            "keep": self.keep,
+        }
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling the requests a `Profiler` selects, and
+    serving the stored profiles at `path`.
+    """
+
+    def __init__(self, app, profiler: Profiler, path: str = "/profiles"):
+        self.app = app
+        self.profiler = profiler
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = app_path(scope)
+        if path == self.path or path.startswith(self.path + "/"):
+            await self._serve_profiles(path[len(self.path) + 1:], send)
+            return
+
+        profiler = self.profiler
+        if not profiler.triggered(scope):
+            await self.app(scope, receive, send)
+            return
+        if profiler.active:
+            # cProfile hooks the whole thread: a second profile would clobber the first
+            profiler.skipped_busy += 1
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profile = cProfile.Profile()
+        profiler.active = True
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.disable()
+            duration = time.perf_counter() - started
+            profiler.active = False
+            profiler.profiled += 1
+            # Written off the event loop: the response has been sent already
+            await run_in_threadpool(profiler.save, profile, scope["method"], path, status, duration)
+
+    async def _serve_profiles(self, name: str, send):
+        if not name:
+            body = json.dumps({**self.profiler.stats(), "profiles": await run_in_threadpool(self.profiler.profiles)})
+            await _respond(send, 200, body.encode(), b"application/json")
+            return
+
+        file = self.profiler.directory / name
+        if NAME.fullmatch(name) is None or not file.is_file():
+            await _respond(send, 404, b'{"detail":"Profile not found"}', b"application/json")
+            return
+        await _respond(send, 200, await run_in_threadpool(file.read_bytes), b"application/octet-stream",
+                       [(b"content-disposition", f'attachment; filename="{name}"'.encode())])
+
+
+def enable_profiling(app, name: str) -> Profiler | None:
+    """
+    Add a `ProfilingMiddleware` to `app` when PROFILE_DIR is set; profiles
+    go to PROFILE_DIR/<name>. PROFILE_SAMPLE_RATE (default 0: header only),
+    PROFILE_KEEP (default 50) and PROFILE_TOKEN (the X-Profile value that
+    triggers a profile, default "1") tune it. Call it after every other
+    `add_middleware`, so the profile covers the whole stack.
+    """
+    directory = os.getenv("PROFILE_DIR")
+    if not directory:
+        return None
+    profiler = Profiler(
+        os.path.join(directory, name),
+        sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+        keep=int(os.getenv("PROFILE_KEEP", "50")),
+        token=os.getenv("PROFILE_TOKEN", "1"),
+    )
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return profiler
+
+
+async def _respond(send, status: int, body: bytes, content_type: bytes, headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
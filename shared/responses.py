@@ -0,0 +1,28 @@
+"""
+Fast JSON responses for Pydantic models.
+
+When an endpoint returns a model (or a dict holding models), FastAPI walks it
+with `jsonable_encoder` into plain dicts and then runs `json.dumps` on them.
+`PydanticJSONResponse` serializes the model straight to JSON bytes with
+pydantic-core instead: no intermediate dicts, one pass in Rust.
+
+    @app.post("/products/{product_id}", response_model=ProductResponse)
+    async def create_product(...):
+        return PydanticJSONResponse(ProductResponse(product_id=..., product=...))
+
+Keep `response_model=` on the route: it still drives the OpenAPI docs.
+"""
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class PydanticJSONResponse(Response):
+    media_type = "application/json"
+
+    def __init__(self, content: BaseModel, *, status_code: int = 200, headers=None, **dump_options):
+        # Options for pydantic-core's to_json, e.g. exclude_unset=True
+        self.dump_options = dump_options
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content, **self.dump_options)
@@ -0,0 +1,131 @@
+"""
+Typeahead name search: prefix and substring queries over item names.
+
+    index = NameIndex(item["name"] for item in items)
+    index.add("games"); index.remove("game")      # kept in sync by the store
+    index.search("gam")                           # names, best matches first
+
+The index works on distinct names (casefolded), never on items, so every
+catalog engine can keep one and map the matched names back to its items
+with its own `find_by_name`:
+
+    - prefix    → sorted list of names + bisect          O(log n + k)
+    - substring → trigram inverted index {gram: names}   candidates from the
+                  rarest trigram of the query, then verified with `in`
+
+Queries shorter than a trigram walk the sorted names lazily and stop as
+soon as the caller has enough results.
+"""
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+
+GRAM = 3
+
+
+def grams(key: str) -> set[str]:
+    return {key[i:i + GRAM] for i in range(len(key) - GRAM + 1)}
+
+
+class NameIndex:
+    """Distinct names, in sorted order and by trigram, with a count per name."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._counts = Counter(names)
+        # (casefolded, name): casefolded first, so "Game" and "game" sort together
+        self._sorted = sorted((name.casefold(), name) for name in self._counts)
+        self._grams: dict[str, set[str]] = {}
+        for key, name in self._sorted:
+            for gram in grams(key):
+                self._grams.setdefault(gram, set()).add(name)
+
+    def __len__(self):
+        return len(self._sorted)
+
+    # ---------------------------
+    # Maintenance (one call per item written)
+    # ---------------------------
+    def add(self, name: str):
+        self._counts[name] += 1
+        if self._counts[name] > 1:
+            return  # already indexed
+        key = name.casefold()
+        insort(self._sorted, (key, name))
+        for gram in grams(key):
+            self._grams.setdefault(gram, set()).add(name)
+
+    def remove(self, name: str):
+        self._counts[name] -= 1
+        if self._counts[name] > 0:
+            return  # other items still have this name
+        del self._counts[name]
+        key = name.casefold()
+        del self._sorted[bisect_left(self._sorted, (key, name))]
+        for gram in grams(key):
+            bucket = self._grams[gram]
+            bucket.discard(name)
+            if not bucket:
+                del self._grams[gram]
+
+    def rename(self, old: str, new: str):
+        if old != new:
+            self.remove(old)
+            self.add(new)
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def search(self, query: str, substring: bool = False) -> Iterator[str]:
+        """
+        Matching names, lazily: prefix matches (sorted), then - for substring
+        queries - the other names containing the query (sorted).
+        """
+        query = query.casefold()
+        if not query:
+            return
+        yield from self._prefix(query)
+        if not substring:
+            return
+
+        if len(query) < GRAM:
+            # Too short for the trigram index: scan the sorted names lazily
+            for key, name in self._sorted:
+                if query in key and not key.startswith(query):
+                    yield name
+            return
+
+        postings = [self._grams.get(gram) for gram in grams(query)]
+        if not all(postings):
+            return  # one trigram matches no name at all
+        candidates = min(postings, key=len)
+        # Verify every candidate, but only sort as many as the caller consumes
+        matches = [(key, name) for name in candidates
+                   if query in (key := name.casefold()) and not key.startswith(query)]
+        heapq.heapify(matches)
+        while matches:
+            yield heapq.heappop(matches)[1]
+
+    def _prefix(self, query: str) -> Iterator[str]:
+        names = self._sorted
+        for i in range(bisect_left(names, (query,)), len(names)):
+            key, name = names[i]
+            if not key.startswith(query):
+                return
+            yield name
+
+
+def search_items(
+    index: NameIndex,
+    find_by_name: Callable[[str], list[dict]],
+    query: str,
+    substring: bool = False,
+    limit: int = 10
+) -> list[dict]:
+    """Up to `limit` items whose name matches, in the order of `index.search`."""
+    results = []
+    for name in index.search(query, substring):
+        results.extend(sorted(find_by_name(name), key=lambda item: item["id"])[:limit - len(results)])
+        if len(results) >= limit:
+            break
+    return results
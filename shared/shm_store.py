@@ -0,0 +1,547 @@
+"""
+Item catalog in shared memory, shared by every worker process on the host.
+
+With `uvicorn api:app --workers 4` each worker normally holds its own copy of
+the catalog, and a write in one worker is invisible to the others. Here the
+items live in one `multiprocessing.shared_memory` segment that every worker
+maps: records are read straight from the segment, never copied per worker.
+
+Layout (little endian):
+    header  magic (8s) | version (Q) | used slots (Q) | capacity (Q)
+    record  id (q) | price (d) | stock (?) | alive (?) | name (NAME_WIDTH s, utf-8)
+    log     LOG_SIZE x (version (Q) | slot (q) | record before the write)
+
+Writes take an exclusive file lock (one writer at a time, across processes)
+and bump `version` twice: odd while the write is in progress, even once it is
+done. A write rejected by its checks (full catalog, duplicate or unknown id)
+does not touch `version`. Readers check the version before and after a read and retry if it
+changed (a seqlock), so they never wait for the lock and never see a
+half-written record. Deletes only clear the `alive` flag; slots are not
+reused, so `capacity` bounds the number of inserts.
+
+Each worker keeps small local indexes of slot numbers (8-byte arrays by id
+order, price order and name) and a name search index; the keys themselves
+are read from the segment. Every write also logs the slot it changes and
+its previous record, so the other workers replay the last changes on their
+next read (~0.2ms per change at 200k items: binary searches and array
+inserts) instead of rebuilding their indexes. A full rebuild, O(n log n) on
+the event loop (~0.7s at 200k items), only happens when a worker attaches,
+when it missed more than LOG_SIZE writes, or when a write lands while it
+replays the log.
+
+A writer that dies mid-write leaves `version` odd: the next writer, or a
+reader that finds the lock free, restores the logged record. Readers give
+up with TimeoutError after READ_TIMEOUT seconds of an odd version.
+
+Only the fields of the lesson catalog are stored: id, name, price, stock.
+"""
+import os
+import struct
+from array import array
+import tempfile
+import time
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+from shared.search import NameIndex, search_items
+from shared.store import BATCH_SIZE
+
+try:
+    import fcntl
+except ImportError as exc:  # the cross-process lock uses flock()
+    raise ImportError("The shared-memory catalog needs fcntl (Linux / macOS)") from exc
+
+MAGIC = b"ITEMSHM2"
+NAME_WIDTH = 48
+HEADER = struct.Struct("<8sQQQ")
+RECORD = struct.Struct(f"<qd??{NAME_WIDTH}s")
+LOG_ENTRY = struct.Struct("<Qq")  # followed by a RECORD
+LOG_SIZE = 4096  # writes a worker can fall behind and still catch up from the log
+READ_TIMEOUT = 1.0  # seconds a reader waits for a write in progress
+COUNTER = struct.Struct("<Q")  # one header field
+VERSION_OFFSET = 8
+USED_OFFSET = 16
+
+
+class SharedMemoryStore:
+    """
+    Same methods as `ItemStore`, backed by a named shared memory segment.
+
+    The first process to open `name` creates the segment and loads `seed`;
+    the others attach to it (their `seed` is ignored).
+    """
+
+    def __init__(self, name: str, seed=(), capacity: int = 65_536):
+        self.name = name
+        self._lock_file = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), "a+b")
+        self._indexed_version = None
+        # Slot numbers only (8 bytes each); keys are read from the segment
+        self._name_slots: dict[str, array] = {}
+        self._price_slots = array("q")  # by (-price, id)
+        self._id_slots = array("q")  # by id
+        self._search = NameIndex()  # distinct names, for prefix / substring search
+
+        with self._locked():
+            try:
+                self._shm = _attach(name)
+                created = False
+            except FileNotFoundError:
+                seed = list(seed)
+                capacity = max(capacity, len(seed))
+                self._shm = _attach(name, size=HEADER.size + capacity * RECORD.size + LOG_SIZE * _LOG_RECORD)
+                created = True
+            self._buf = self._shm.buf
+            if created or bytes(self._buf[:len(MAGIC)]) != MAGIC:
+                self._load(list(seed))
+            self._capacity = HEADER.unpack_from(self._buf, 0)[3]
+
+    def close(self):
+        """Unmap the segment in this process (the data stays for the others)."""
+        self._buf.release()
+        self._shm.close()
+        self._lock_file.close()
+
+    def unlink(self):
+        """Remove the segment for good (e.g. on deploy, before the new workers start)."""
+        resource_tracker.register(self._shm._name, "shared_memory")  # unlink() unregisters it
+        self._shm.unlink()
+
+    @property
+    def version(self) -> int:
+        return COUNTER.unpack_from(self._buf, VERSION_OFFSET)[0]
+
+    def __len__(self):
+        return self._read(lambda: len(self._id_slots))
+
+    def __iter__(self):
+        return iter(self._read(lambda: [self._row(slot) for slot in self._id_slots]))
+
+    def __contains__(self, item_id):
+        return self._read(lambda: self._slot(item_id) is not None)
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def get(self, item_id: int) -> dict | None:
+        def query():
+            slot = self._slot(item_id)
+            return None if slot is None else self._row(slot)
+        return self._read(query)
+
+    def find_by_name(self, name: str) -> list[dict]:
+        return self._read(lambda: [self._row(slot) for slot in self._name_slots.get(name, ())])
+
+    def search(self, query: str, substring: bool = False, limit: int = 10) -> list[dict]:
+        """Up to `limit` items whose name starts with (or contains) `query`."""
+        def query_items():
+            def find(name):
+                return [self._row(slot) for slot in self._name_slots.get(name, ())]
+            return search_items(self._search, find, query, substring, limit)
+        return self._read(query_items)
+
+    def by_price(
+        self,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        start: int = 0,
+        limit: int | None = None
+    ) -> list[dict]:
+        """Items with min_price <= price <= max_price, most expensive first (`start` / `limit` page)."""
+        def query():
+            lo, hi = self._price_range(min_price, max_price)
+            lo = min(lo + max(start, 0), hi)
+            if limit is not None:
+                hi = min(hi, lo + max(limit, 0))
+            return [self._row(slot) for slot in self._price_slots[lo:hi]]
+        return self._read(query)
+
+    def count_by_price(self, min_price: float | None = None, max_price: float | None = None) -> int:
+        def query():
+            lo, hi = self._price_range(min_price, max_price)
+            return max(hi - lo, 0)
+        return self._read(query)
+
+    def in_stock(self, flag: bool = True) -> list[dict]:
+        def query():
+            rows = (self._row(slot) for slot in self._id_slots)
+            return [row for row in rows if row["stock"] == flag]
+        return self._read(query)
+
+    def page(self, start: int = 0, size: int = 10) -> list[dict]:
+        """Offset pagination (ordered by id), with list slice semantics: items[start:start + size]."""
+        return self._read(lambda: [self._row(slot) for slot in self._id_slots[start:start + size]])
+
+    def page_after(self, after_id: int | None = None, limit: int = 10) -> tuple[list[dict], int | None]:
+        """Keyset pagination: up to `limit` items with id > after_id."""
+        if limit <= 0:
+            return [], None
+
+        def query():
+            slots = self._id_slots
+            start = 0 if after_id is None else bisect_right(slots, after_id, key=self._id)
+            page = [self._row(slot) for slot in slots[start:start + limit]]
+            has_more = start + limit < len(slots)
+            return page, (page[-1]["id"] if has_more else None)
+        return self._read(query)
+
+    # ---------------------------
+    # Lazy listings (streaming)
+    # ---------------------------
+    # The slot numbers are copied up front (8 bytes each); the records are
+    # read BATCH_SIZE at a time, each batch as one consistent read
+    def iter_by_name(self, name: str):
+        return self._iter_slots(self._read(lambda: array("q", self._name_slots.get(name, ()))))
+
+    def iter_by_price(self, min_price: float | None = None, max_price: float | None = None):
+        def query():
+            lo, hi = self._price_range(min_price, max_price)
+            return self._price_slots[lo:hi]
+        return self._iter_slots(self._read(query))
+
+    def iter_in_stock(self, flag: bool = True):
+        rows = self._iter_slots(self._read(lambda: self._id_slots[:]))
+        return (row for row in rows if row["stock"] == flag)
+
+    def iter_page(self, start: int = 0, size: int = 10):
+        return self._iter_slots(self._read(lambda: self._id_slots[start:start + size]))
+
+    def _iter_slots(self, slots: array):
+        for i in range(0, len(slots), BATCH_SIZE):
+            batch = slots[i:i + BATCH_SIZE]
+            yield from self._read(lambda: self._live_rows(batch))
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def insert(self, item: dict) -> dict:
+        """Insert one item; an item without "id" gets the next free id."""
+        _check_name(item["name"])  # before the write starts
+        with self._writing():
+            _, _, used, capacity = HEADER.unpack_from(self._buf, 0)
+            if "id" not in item:
+                item = {"id": self._id(self._id_slots[-1]) + 1 if self._id_slots else 1, **item}
+            if self._slot(item["id"]) is not None:
+                raise KeyError(f"Item {item['id']} already exists")
+            if used == capacity:
+                raise ValueError(f"The shared catalog is full ({capacity} slots)")
+
+            self._begin()
+            self._log(used)
+            self._pack(used, item)
+            self._set_used(used + 1)
+            self._index(used, item)
+        return item
+
+    def update(self, item_id: int, **changes) -> dict:
+        if "id" in changes and changes["id"] != item_id:
+            raise ValueError("The id of an item cannot be changed")
+        if "name" in changes:
+            _check_name(changes["name"])  # before the write starts
+        with self._writing():
+            slot = self._slot(item_id)
+            if slot is None:
+                raise KeyError(item_id)
+            item = self._row(slot)
+            self._begin()
+            self._unindex(slot, item)
+            item.update(changes)
+            self._log(slot)
+            self._pack(slot, item)
+            self._index(slot, item)
+        return item
+
+    def delete(self, item_id: int) -> dict:
+        with self._writing():
+            slot = self._slot(item_id)
+            if slot is None:
+                raise KeyError(item_id)
+            item = self._row(slot)
+            self._begin()
+            self._unindex(slot, item)
+            self._log(slot)
+            RECORD.pack_into(self._buf, _offset(slot), item_id, item["price"], item["stock"], False,
+                             item["name"].encode())
+        return item
+
+    # ---------------------------
+    # Consistency (lock + version counter)
+    # ---------------------------
+    @contextmanager
+    def _locked(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self):
+        """
+        Hold the lock with the local indexes up to date. A write runs its
+        checks first and calls `_begin()` right before changing the segment:
+        a write rejected by its checks leaves the version alone, so no worker
+        replays anything and no response cache is invalidated.
+        """
+        with self._locked():
+            version = self._recover()  # even: no other writer while we hold the lock
+            if version != self._indexed_version:
+                self._catch_up(version)
+                self._indexed_version = version
+            used = HEADER.unpack_from(self._buf, 0)[2]
+            self._write_version = None
+            try:
+                yield
+            except BaseException:
+                if self._write_version is not None:
+                    self._rollback(version, used)
+                raise
+            if self._write_version is not None:
+                self._indexed_version = self._write_version  # indexes were updated in place
+                COUNTER.pack_into(self._buf, VERSION_OFFSET, self._write_version)
+
+    def _begin(self):
+        """Publish the odd version: the segment is about to change."""
+        self._write_version = self._indexed_version + 2
+        COUNTER.pack_into(self._buf, VERSION_OFFSET, self._indexed_version + 1)  # readers: retry
+
+    def _rollback(self, version: int, used: int):
+        """Undo a write that failed half way: logged record, slot count, then the even version."""
+        offset = _log_offset(self._capacity, self._write_version)
+        logged_version, slot = LOG_ENTRY.unpack_from(self._buf, offset)
+        if logged_version == self._write_version:
+            start = offset + LOG_ENTRY.size
+            self._buf[_offset(slot):_offset(slot) + RECORD.size] = self._buf[start:start + RECORD.size]
+        self._set_used(used)
+        self._indexed_version = None  # only the local indexes may be half updated: rebuild them
+        COUNTER.pack_into(self._buf, VERSION_OFFSET, version)
+
+    def _read(self, query):
+        """Run `query` against a consistent snapshot (retry if a write overlapped)."""
+        deadline = None
+        while True:
+            version = self.version
+            if version % 2:
+                # A write is in progress, or its writer died: a free lock tells them apart
+                deadline = deadline or time.monotonic() + READ_TIMEOUT
+                if self._try_recover():
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError("The shared catalog is locked by a write that does not finish")
+                time.sleep(0)
+                continue
+            caught_up = version != self._indexed_version
+            try:
+                if caught_up:
+                    self._catch_up(version)
+                    self._indexed_version = version
+                result = query()
+            except (KeyError, IndexError, ValueError, UnicodeDecodeError):
+                if self.version == version:
+                    raise
+                result = None
+            if self.version == version:
+                return result
+            if caught_up:
+                self._indexed_version = None  # replayed from a torn read: rebuild
+            deadline = deadline or time.monotonic() + READ_TIMEOUT
+            if time.monotonic() > deadline:
+                raise TimeoutError("The shared catalog changes faster than it can be read")
+
+    def _recover(self) -> int:
+        """
+        Under the lock: finish the write of a writer that died half way (odd
+        version) by restoring the record it had logged. Returns the version.
+        """
+        version = self.version
+        if version % 2:
+            logged_version, slot = LOG_ENTRY.unpack_from(self._buf, _log_offset(self._capacity, version + 1))
+            if logged_version == version + 1:
+                start = _log_offset(self._capacity, version + 1) + LOG_ENTRY.size
+                self._buf[_offset(slot):_offset(slot) + RECORD.size] = self._buf[start:start + RECORD.size]
+            version += 1
+            COUNTER.pack_into(self._buf, VERSION_OFFSET, version)
+        return version
+
+    def _try_recover(self) -> bool:
+        # Readers never block on the lock: only take it if nobody holds it
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        try:
+            self._recover()
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        return True
+
+    def _log(self, slot: int):
+        """Record `slot` and its current content before the write changes it."""
+        offset = _log_offset(self._capacity, self._write_version)
+        LOG_ENTRY.pack_into(self._buf, offset, self._write_version, slot)
+        start = offset + LOG_ENTRY.size
+        self._buf[start:start + RECORD.size] = self._buf[_offset(slot):_offset(slot) + RECORD.size]
+
+    def _catch_up(self, version: int):
+        """Bring the local indexes to `version`: replay the log, else rebuild them."""
+        if self._indexed_version is None or not self._replay(self._indexed_version, version):
+            self._reindex()
+
+    def _replay(self, since: int, version: int) -> bool:
+        if not 0 < version - since <= 2 * LOG_SIZE:
+            return False
+        # Each changed slot as the local indexes know it: its record before the first change
+        before: dict[int, tuple] = {}
+        for logged in range(since + 2, version + 1, 2):
+            offset = _log_offset(self._capacity, logged)
+            logged_version, slot = LOG_ENTRY.unpack_from(self._buf, offset)
+            if logged_version != logged:
+                return False  # overwritten by newer writes (or never written)
+            if slot not in before:
+                before[slot] = RECORD.unpack_from(self._buf, offset + LOG_ENTRY.size)
+
+        # Take every changed slot out first (ordered by its old price), so the
+        # slots left in the arrays all match the keys now in the segment
+        old_price_keys = {slot: (-price, item_id) for slot, (item_id, price, _, alive, _) in before.items() if alive}
+
+        def price_key(slot):
+            return old_price_keys.get(slot) or self._price_key(slot)
+
+        for slot, (item_id, price, _, alive, name) in before.items():
+            if not alive:
+                continue
+            name = _decode(name)
+            bucket = self._name_slots[name]
+            bucket.remove(slot)
+            if not bucket:
+                del self._name_slots[name]
+            self._search.remove(name)
+            del self._price_slots[bisect_left(self._price_slots, (-price, item_id), key=price_key)]
+            del self._id_slots[bisect_left(self._id_slots, item_id, key=self._id)]
+
+        for slot in before:
+            if RECORD.unpack_from(self._buf, _offset(slot))[3]:
+                self._index(slot, self._row(slot))
+        return True
+
+    def _reindex(self):
+        used = HEADER.unpack_from(self._buf, 0)[2]
+        self._name_slots = {}
+        alive_slots = array("q")
+        for slot in range(used):
+            _, _, _, alive, name = RECORD.unpack_from(self._buf, _offset(slot))
+            if alive:
+                alive_slots.append(slot)
+                self._name_slots.setdefault(_decode(name), array("q")).append(slot)
+        self._search = NameIndex(name for name, slots in self._name_slots.items() for _ in slots)
+        self._id_slots = array("q", sorted(alive_slots, key=self._id))
+        # Stable sort of the id order by price: (-price, id) without building tuple keys
+        self._price_slots = array("q", sorted(self._id_slots, key=self._neg_price))
+
+    # ---------------------------
+    # Helpers
+    # ---------------------------
+    def _load(self, items: list[dict]):
+        capacity = (self._shm.size - HEADER.size - LOG_SIZE * _LOG_RECORD) // RECORD.size
+        if len(items) > capacity:
+            raise ValueError(f"{len(items)} items do not fit in {capacity} slots")
+        HEADER.pack_into(self._buf, 0, b"\0" * len(MAGIC), 0, 0, capacity)
+        seen = set()
+        for slot, item in enumerate(items):
+            if item["id"] in seen:
+                raise KeyError("Duplicate item ids")
+            seen.add(item["id"])
+            self._pack(slot, item)
+        # Magic last: a crashed loader leaves a segment the next worker reloads
+        HEADER.pack_into(self._buf, 0, MAGIC, 0, len(items), capacity)
+
+    def _pack(self, slot: int, item: dict):
+        RECORD.pack_into(self._buf, _offset(slot), item["id"], item["price"], item["stock"], True,
+                         _check_name(item["name"]))
+
+    def _set_used(self, used: int):
+        COUNTER.pack_into(self._buf, USED_OFFSET, used)
+
+    def _row(self, slot: int) -> dict:
+        item_id, price, stock, _, name = RECORD.unpack_from(self._buf, _offset(slot))
+        return {"id": item_id, "name": _decode(name), "price": price, "stock": stock}
+
+    def _live_rows(self, slots: array) -> list[dict]:
+        # Slots are never reused: a copied slot number still holds its item,
+        # unless the item was deleted since
+        rows = []
+        for slot in slots:
+            item_id, price, stock, alive, name = RECORD.unpack_from(self._buf, _offset(slot))
+            if alive:
+                rows.append({"id": item_id, "name": _decode(name), "price": price, "stock": stock})
+        return rows
+
+    def _id(self, slot: int) -> int:
+        return struct.unpack_from("<q", self._buf, _offset(slot))[0]
+
+    def _neg_price(self, slot: int) -> float:
+        return -struct.unpack_from("<d", self._buf, _offset(slot) + 8)[0]
+
+    def _price_key(self, slot: int) -> tuple[float, int]:
+        item_id, price = struct.unpack_from("<qd", self._buf, _offset(slot))
+        return -price, item_id
+
+    def _price_range(self, min_price: float | None, max_price: float | None) -> tuple[int, int]:
+        slots = self._price_slots
+        # Keys are read from the segment during the binary search: O(log n) record reads
+        lo = 0 if max_price is None else bisect_left(slots, -max_price, key=self._neg_price)
+        hi = len(slots) if min_price is None else bisect_right(slots, -min_price, key=self._neg_price)
+        return lo, hi
+
+    def _slot(self, item_id: int) -> int | None:
+        # Binary search over the id-ordered slots: O(log n) record reads, no dict per worker
+        slots = self._id_slots
+        i = bisect_left(slots, item_id, key=self._id)
+        return slots[i] if i < len(slots) and self._id(slots[i]) == item_id else None
+
+    def _index(self, slot: int, item: dict):
+        self._name_slots.setdefault(item["name"], array("q")).append(slot)
+        self._search.add(item["name"])
+        insort(self._price_slots, slot, key=self._price_key)
+        insort(self._id_slots, slot, key=self._id)
+
+    def _unindex(self, slot: int, item: dict):
+        bucket = self._name_slots[item["name"]]
+        bucket.remove(slot)
+        if not bucket:
+            del self._name_slots[item["name"]]
+        self._search.remove(item["name"])
+        del self._price_slots[bisect_left(self._price_slots, (-item["price"], item["id"]), key=self._price_key)]
+        del self._id_slots[bisect_left(self._id_slots, item["id"], key=self._id)]
+
+
+_LOG_RECORD = LOG_ENTRY.size + RECORD.size
+
+
+def _offset(slot: int) -> int:
+    return HEADER.size + slot * RECORD.size
+
+
+def _log_offset(capacity: int, version: int) -> int:
+    # One entry per write, i.e. per 2 versions
+    return HEADER.size + capacity * RECORD.size + (version // 2 % LOG_SIZE) * _LOG_RECORD
+
+
+def _check_name(name: str) -> bytes:
+    encoded = name.encode()
+    if len(encoded) > NAME_WIDTH:
+        raise ValueError(f"Item names are limited to {NAME_WIDTH} bytes in the shared catalog")
+    return encoded
+
+
+def _decode(name: bytes) -> str:
+    return name.rstrip(b"\0").decode()
+
+
+def _attach(name: str, size: int = 0) -> shared_memory.SharedMemory:
+    """Open (size=0) or create a segment that outlives the process that made it."""
+    shm = shared_memory.SharedMemory(name, create=size > 0, size=size)
+    # Python < 3.13 registers every segment with the resource tracker, which
+    # unlinks it when *this* process exits, under the other workers' feet
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
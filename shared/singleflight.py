@@ -0,0 +1,47 @@
+"""
+Single-flight: concurrent identical calls share one execution.
+
+When a burst of identical requests arrives at once (e.g. right after the
+cache was invalidated), the first one does the work and the others await
+its result instead of redoing the same sort / filter / encoding in parallel.
+
+    result, shared = await flights.do(key, lambda: compute())
+"""
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Per-key in-flight calls, plus counters of how much work was saved."""
+
+    def __init__(self):
+        self.leaders = 0  # calls that did the work
+        self.coalesced = 0  # calls that awaited a leader instead
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]) -> tuple[object, bool]:
+        """
+        Run `fn()` unless a call with the same key is already running.
+
+        Returns (result, shared): shared is True for the callers that got
+        the leader's result. If the leader failed, they get None and should
+        do the work themselves.
+        """
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced += 1
+            # shield: a cancelled follower must not cancel the shared future
+            return await asyncio.shield(call), True
+
+        call = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.leaders += 1
+        result = None
+        try:
+            result = await fn()
+            return result, False
+        finally:
+            del self._calls[key]
+            call.set_result(result)
+
+    def stats(self) -> dict:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._calls)}
@@ -0,0 +1,326 @@
+"""
+SQLite-backed item catalog with a pool of connections.
+
+Unlike the in-memory stores, the catalog survives restarts and is shared by
+every worker process that opens the same database file.
+
+- WAL mode: readers never block the writer (and vice versa)
+- indexes on id (primary key), name, price and stock, plus a case-insensitive
+  name index for prefix search (LIKE 'gam%' becomes an index range scan;
+  substring search, LIKE '%gam%', still scans the table)
+- every query runs in the threadpool on a pooled connection, so SQLite I/O
+  never blocks the event loop
+
+All methods are coroutines, like `shared.store.AsyncStore`, so endpoints can
+`await` either backend.
+"""
+import asyncio
+import sqlite3
+
+from starlette.concurrency import run_in_threadpool
+
+from shared.store import BATCH_SIZE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT    NOT NULL,
+    price       NUMERIC NOT NULL,
+    stock       INTEGER NOT NULL DEFAULT 1,
+    description TEXT,
+    tax         NUMERIC
+);
+CREATE INDEX IF NOT EXISTS items_name  ON items (name);
+CREATE INDEX IF NOT EXISTS items_name_nocase ON items (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS items_price ON items (price DESC, id);
+CREATE INDEX IF NOT EXISTS items_stock ON items (stock, id);
+"""
+
+COLUMNS = ("id", "name", "price", "stock", "description", "tax")
+SELECT = "SELECT id, name, price, stock, description, tax FROM items"
+
+
+def connect(path: str) -> sqlite3.Connection:
+    # check_same_thread=False: a pooled connection is used by one thread at a
+    # time, but not always the same one
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, much faster commits
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections, handed out one task at a time."""
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self.size = size
+        self._idle: asyncio.Queue | None = None
+
+    async def run(self, fn, *args):
+        """Run `fn(conn, *args)` in the threadpool on a pooled connection."""
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self.size):
+                self._idle.put_nowait(connect(self.path))
+
+        conn = await self._idle.get()
+        try:
+            return await run_in_threadpool(fn, conn, *args)
+        finally:
+            self._idle.put_nowait(conn)
+
+    def close(self):
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+        self._idle = None
+
+
+class SQLiteItemStore:
+    """Item catalog in a SQLite database (same methods as `AsyncStore`)."""
+
+    def __init__(self, path: str, seed=(), pool_size: int = 4):
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+
+        # Schema + seed data once, synchronously, at startup
+        conn = connect(path)
+        with conn:
+            conn.executescript(SCHEMA)
+            if conn.execute("SELECT 1 FROM items LIMIT 1").fetchone() is None:
+                conn.executemany(_insert_sql(), [_row(item) for item in seed])
+        conn.close()
+
+        # `PRAGMA data_version` changes whenever another connection commits,
+        # which makes it a cheap cross-process catalog version
+        self._version_conn = connect(path)
+
+    @property
+    def version(self) -> int:
+        return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    async def close(self):
+        self.pool.close()
+        self._version_conn.close()
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    async def count(self) -> int:
+        return await self.pool.run(lambda conn: conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+
+    async def get(self, item_id: int) -> dict | None:
+        rows = await self.pool.run(_fetch, f"{SELECT} WHERE id = ?", (item_id,))
+        return rows[0] if rows else None
+
+    async def find_by_name(self, name: str) -> list[dict]:
+        return await self.pool.run(_fetch, f"{SELECT} WHERE name = ? ORDER BY id", (name,))
+
+    async def search(self, query: str, substring: bool = False, limit: int = 10) -> list[dict]:
+        """Up to `limit` items whose name starts with (or contains) `query`, prefix matches first."""
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        prefix = escaped + "%"
+        if not substring:
+            sql = f"{SELECT} WHERE name LIKE ? ESCAPE '\\' ORDER BY name COLLATE NOCASE, id LIMIT ?"
+            return await self.pool.run(_fetch, sql, (prefix, limit))
+        sql = (f"{SELECT} WHERE name LIKE ? ESCAPE '\\' "
+               f"ORDER BY name NOT LIKE ? ESCAPE '\\', name COLLATE NOCASE, id LIMIT ?")
+        return await self.pool.run(_fetch, sql, ("%" + prefix, prefix, limit))
+
+    async def by_price(
+        self,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        start: int = 0,
+        limit: int | None = None
+    ) -> list[dict]:
+        """Items with min_price <= price <= max_price, most expensive first (`start` / `limit` page)."""
+        where, params = _price_where(min_price, max_price)
+        # LIMIT -1 → no limit
+        sql = SELECT + where + " ORDER BY price DESC, id LIMIT ? OFFSET ?"
+        return await self.pool.run(_fetch, sql, (*params, -1 if limit is None else max(limit, 0), max(start, 0)))
+
+    async def count_by_price(self, min_price: float | None = None, max_price: float | None = None) -> int:
+        where, params = _price_where(min_price, max_price)
+        return await self.pool.run(lambda conn: conn.execute("SELECT COUNT(*) FROM items" + where, params).fetchone()[0])
+
+    async def in_stock(self, flag: bool = True) -> list[dict]:
+        return await self.pool.run(_fetch, f"{SELECT} WHERE stock = ? ORDER BY id", (int(flag),))
+
+    async def page(self, start: int = 0, size: int = 10) -> list[dict]:
+        """Offset pagination (ordered by id), with list slice semantics: items[start:start + size]."""
+        if start < 0 or start + size < 0:
+            # Negative bounds count from the end, as in a Python slice: resolve them first
+            rows = range(await self.count())[start:start + size]
+            start, size = rows.start, len(rows)
+        return await self.pool.run(_fetch, f"{SELECT} ORDER BY id LIMIT ? OFFSET ?", (max(size, 0), start))
+
+    async def page_after(self, after_id: int | None = None, limit: int = 10) -> tuple[list[dict], int | None]:
+        """Keyset pagination: up to `limit` items with id > after_id."""
+        if limit <= 0:
+            return [], None
+        # One extra row tells us whether there is a next page
+        rows = await self.pool.run(
+            _fetch, f"{SELECT} WHERE id > ? ORDER BY id LIMIT ?",
+            (-1 if after_id is None else after_id, limit + 1))
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1]["id"]
+        return rows, None
+
+    # ---------------------------
+    # Lazy listings (streaming)
+    # ---------------------------
+    async def iter_by_name(self, name: str):
+        def query(last, size):
+            return f"{SELECT} WHERE name = ? AND id > ? ORDER BY id LIMIT ?", (name, _after(last), size)
+        async for row in self._keyset(query):
+            yield row
+
+    async def iter_by_price(self, min_price: float | None = None, max_price: float | None = None):
+        where, params = _price_where(min_price, max_price)
+
+        def query(last, size):
+            if last is None:
+                return SELECT + where + " ORDER BY price DESC, id LIMIT ?", (*params, size)
+            # After (price, id) in "price DESC, id" order
+            keyset = (" AND " if where else " WHERE ") + "price <= ? AND (price < ? OR id > ?)"
+            sql = SELECT + where + keyset + " ORDER BY price DESC, id LIMIT ?"
+            return sql, (*params, last["price"], last["price"], last["id"], size)
+        async for row in self._keyset(query):
+            yield row
+
+    async def iter_in_stock(self, flag: bool = True):
+        def query(last, size):
+            return f"{SELECT} WHERE stock = ? AND id > ? ORDER BY id LIMIT ?", (int(flag), _after(last), size)
+        async for row in self._keyset(query):
+            yield row
+
+    async def iter_page(self, start: int = 0, size: int = 10):
+        if start < 0 or start + size < 0:
+            rows = range(await self.count())[start:start + size]
+            start, size = rows.start, len(rows)
+
+        def query(last, batch):
+            if last is None:
+                return f"{SELECT} ORDER BY id LIMIT ? OFFSET ?", (batch, start)
+            return f"{SELECT} WHERE id > ? ORDER BY id LIMIT ?", (last["id"], batch)
+        async for row in self._keyset(query, max(size, 0)):
+            yield row
+
+    async def _keyset(self, query, total: int | None = None):
+        """
+        The rows of `query(last, size)` (SQL + params for the `size` rows after
+        the row `last`, None at first), BATCH_SIZE at a time: each batch is a
+        separate query, so no connection is held while the client reads.
+        """
+        last = None
+        while total is None or total > 0:
+            size = BATCH_SIZE if total is None else min(BATCH_SIZE, total)
+            rows = await self.pool.run(_fetch, *query(last, size))
+            for row in rows:
+                yield row
+            if len(rows) < size:
+                return
+            last = rows[-1]
+            if total is not None:
+                total -= len(rows)
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    async def insert(self, item: dict) -> dict:
+        """Insert one item; an item without "id" gets the next free id."""
+        return (await self.insert_many([item]))[0]
+
+    async def insert_many(self, items: list[dict]) -> list[dict]:
+        """Insert several items in a single transaction; returns copies with their ids."""
+        def write(conn):
+            saved = []
+            with conn:
+                for item in items:
+                    try:
+                        cursor = conn.execute(_insert_sql(), _row(item))
+                    except sqlite3.IntegrityError as exc:
+                        raise KeyError(f"Item {item.get('id')} already exists") from exc
+                    saved.append({"id": cursor.lastrowid, **item})
+            return saved
+        return await self.pool.run(write)
+
+    async def update(self, item_id: int, **changes) -> dict:
+        if "id" in changes and changes["id"] != item_id:
+            raise ValueError("The id of an item cannot be changed")
+        changes.pop("id", None)
+        unknown = set(changes) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown item fields: {sorted(unknown)}")
+
+        def write(conn):
+            with conn:
+                if changes:
+                    assignments = ", ".join(f"{column} = ?" for column in changes)
+                    conn.execute(f"UPDATE items SET {assignments} WHERE id = ?", (*changes.values(), item_id))
+                rows = _fetch(conn, f"{SELECT} WHERE id = ?", (item_id,))
+            if not rows:
+                raise KeyError(item_id)
+            return rows[0]
+        return await self.pool.run(write)
+
+    async def delete(self, item_id: int) -> dict:
+        def write(conn):
+            with conn:
+                rows = _fetch(conn, f"{SELECT} WHERE id = ?", (item_id,))
+                if not rows:
+                    raise KeyError(item_id)
+                conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            return rows[0]
+        return await self.pool.run(write)
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def _insert_sql() -> str:
+    return f"INSERT INTO items ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def _price_where(min_price: float | None, max_price: float | None) -> tuple[str, list]:
+    where, params = [], []
+    if min_price is not None:
+        where.append("price >= ?")
+        params.append(min_price)
+    if max_price is not None:
+        where.append("price <= ?")
+        params.append(max_price)
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def _after(last: dict | None) -> int:
+    # Keyset position in id order: every id is > -1
+    return -1 if last is None else last["id"]
+
+
+def _row(item: dict) -> tuple:
+    return (
+        item.get("id"),  # None → SQLite picks the next rowid
+        item["name"],
+        item["price"],
+        int(item.get("stock", True)),
+        item.get("description"),
+        item.get("tax"),
+    )
+
+
+def _fetch(conn: sqlite3.Connection, sql: str, params=()) -> list[dict]:
+    items = []
+    for item_id, name, price, stock, description, tax in conn.execute(sql, params):
+        item = {"id": item_id, "name": name, "price": price, "stock": bool(stock)}
+        # Optional columns only show up when they are set
+        if description is not None:
+            item["description"] = description
+        if tax is not None:
+            item["tax"] = tax
+        items.append(item)
+    return items
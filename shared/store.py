@@ -0,0 +1,334 @@
+"""
+In-memory item catalog with hash indexes.
+
+Items are plain dicts ({"id": ..., "name": ..., "price": ..., "stock": ...}),
+exactly like the `items` list used in the lessons, but lookups by id, name or
+price range no longer scan (or sort) the whole catalog.
+"""
+import base64
+import binascii
+import math
+from bisect import bisect_left, bisect_right, insort
+
+from shared.search import NameIndex, search_items
+
+BATCH_SIZE = 256  # rows the columnar / shm / SQLite iter_* methods build at a time
+
+
+class ItemStore:
+    """
+    Item catalog indexed by id, name and price.
+
+    - by id    → dict {id: item}                 (O(1) lookup)
+    - by name  → multi-map {name: {id: item}}    (O(1) lookup, O(k) results)
+    - by price → sorted list of (-price, id)     (O(log n + k) range scan, O(log n) count)
+    - ordered  → sorted list of ids              (O(log n + k) keyset pages)
+    - search   → NameIndex of distinct names     (prefix / substring typeahead)
+
+    The iter_* methods are lazy versions of the listings, for streamed
+    responses: they copy the index slice they walk (ids only), so writes
+    made while a client reads don't break the iteration.
+
+    All indexes are kept in sync on insert, update and delete, and every
+    accepted write bumps `version` (used to invalidate cached responses);
+    a write rejected with KeyError / ValueError leaves it alone.
+    Iteration follows insertion order.
+    """
+
+    def __init__(self, items=()):
+        self.version = 0
+        self._by_id: dict[int, dict] = {}
+        self._by_name: dict[str, dict[int, dict]] = {}
+        # Negated prices so the list is already in "most expensive first" order
+        self._by_price: list[tuple[float, int]] = []
+        self._ids: list[int] = []
+        for item in items:
+            self._link(item)
+            self._by_price.append((-item["price"], item["id"]))
+            self._ids.append(item["id"])
+        # One O(n log n) sort instead of n insorts
+        self._by_price.sort()
+        self._ids.sort()
+        self._search = NameIndex(item["name"] for item in self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __contains__(self, item_id):
+        return item_id in self._by_id
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def get(self, item_id: int) -> dict | None:
+        return self._by_id.get(item_id)
+
+    def find_by_name(self, name: str) -> list[dict]:
+        return list(self._by_name.get(name, {}).values())
+
+    def search(self, query: str, substring: bool = False, limit: int = 10) -> list[dict]:
+        """Up to `limit` items whose name starts with (or contains) `query`."""
+        return search_items(self._search, self.find_by_name, query, substring, limit)
+
+    def by_price(
+        self,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        start: int = 0,
+        limit: int | None = None
+    ) -> list[dict]:
+        """
+        Items with min_price <= price <= max_price, most expensive first.
+        `start` / `limit` page through the range: O(log n + limit).
+        """
+        lo, hi = self._price_range(min_price, max_price)
+        lo = min(lo + max(start, 0), hi)
+        if limit is not None:
+            hi = min(hi, lo + max(limit, 0))
+        return [self._by_id[item_id] for _, item_id in self._by_price[lo:hi]]
+
+    def count_by_price(self, min_price: float | None = None, max_price: float | None = None) -> int:
+        """Number of items in the price range, from two bisects: O(log n)."""
+        lo, hi = self._price_range(min_price, max_price)
+        return max(hi - lo, 0)
+
+    def in_stock(self, flag: bool = True) -> list[dict]:
+        return [item for item in self._by_id.values() if item["stock"] == flag]
+
+    def page(self, start: int = 0, size: int = 10) -> list[dict]:
+        """Offset pagination (ordered by id), with list slice semantics: items[start:start + size]."""
+        return [self._by_id[item_id] for item_id in self._ids[start:start + size]]
+
+    def page_after(self, after_id: int | None = None, limit: int = 10) -> tuple[list[dict], int | None]:
+        """
+        Keyset pagination: up to `limit` items with id > after_id.
+        Returns the page and the id to continue after (None on the last page).
+        """
+        if limit <= 0:
+            return [], None
+        start = 0 if after_id is None else bisect_right(self._ids, after_id)
+        page_ids = self._ids[start:start + limit]
+        has_more = start + limit < len(self._ids)
+        return [self._by_id[item_id] for item_id in page_ids], (page_ids[-1] if has_more else None)
+
+    # ---------------------------
+    # Lazy listings (streaming)
+    # ---------------------------
+    def iter_by_name(self, name: str):
+        return iter(self.find_by_name(name))
+
+    def iter_by_price(self, min_price: float | None = None, max_price: float | None = None):
+        lo, hi = self._price_range(min_price, max_price)
+        return self._iter_ids(item_id for _, item_id in self._by_price[lo:hi])
+
+    def iter_in_stock(self, flag: bool = True):
+        return (item for item in list(self._by_id.values()) if item["stock"] == flag)
+
+    def iter_page(self, start: int = 0, size: int = 10):
+        return self._iter_ids(self._ids[start:start + size])
+
+    def _iter_ids(self, ids):
+        # Items deleted since the ids were copied are skipped
+        for item_id in ids:
+            item = self._by_id.get(item_id)
+            if item is not None:
+                yield item
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def insert(self, item: dict) -> dict:
+        """
+        Insert a copy of `item` and return it; an item without "id" gets
+        the next free id.
+        """
+        item_id = item["id"] if "id" in item else (self._ids[-1] + 1 if self._ids else 1)
+        item = {"id": item_id, **item}
+        self._link(item)  # raises KeyError for a duplicate id
+        self.version += 1  # only once the write is accepted
+        self._search.add(item["name"])
+        insort(self._by_price, (-item["price"], item["id"]))
+        insort(self._ids, item["id"])
+        return item
+
+    def update(self, item_id: int, **changes) -> dict:
+        item = self._by_id[item_id]
+        if "id" in changes and changes["id"] != item_id:
+            raise ValueError("The id of an item cannot be changed")
+        self.version += 1
+
+        old_name, old_price = item["name"], item["price"]
+        item.update(changes)
+
+        # Move the item to its new name bucket / price position
+        if item["name"] != old_name:
+            self._unlink_name(old_name, item_id)
+            self._by_name.setdefault(item["name"], {})[item_id] = item
+            self._search.rename(old_name, item["name"])
+        if item["price"] != old_price:
+            self._unlink_price(old_price, item_id)
+            insort(self._by_price, (-item["price"], item_id))
+        return item
+
+    def delete(self, item_id: int) -> dict:
+        item = self._by_id.pop(item_id)
+        self.version += 1
+        self._unlink_name(item["name"], item_id)
+        self._search.remove(item["name"])
+        self._unlink_price(item["price"], item_id)
+        del self._ids[bisect_left(self._ids, item_id)]
+        return item
+
+    def _link(self, item: dict):
+        item_id = item["id"]
+        if item_id in self._by_id:
+            raise KeyError(f"Item {item_id} already exists")
+
+        self._by_id[item_id] = item
+        self._by_name.setdefault(item["name"], {})[item_id] = item
+
+    def _unlink_name(self, name: str, item_id: int):
+        bucket = self._by_name[name]
+        del bucket[item_id]
+        if not bucket:
+            del self._by_name[name]
+
+    def _price_range(self, min_price: float | None, max_price: float | None) -> tuple[int, int]:
+        # Positions in the (-price, id) list: [lo, hi) is the price range
+        lo = 0 if max_price is None else bisect_left(self._by_price, (-max_price, -math.inf))
+        hi = len(self._by_price) if min_price is None else bisect_right(self._by_price, (-min_price, math.inf))
+        return lo, hi
+
+    def _unlink_price(self, price: float, item_id: int):
+        del self._by_price[bisect_left(self._by_price, (-price, item_id))]
+
+
+class AsyncStore:
+    """
+    Async facade over an in-memory store (`ItemStore` / `ColumnarStore`).
+
+    The methods just call the wrapped store (no thread hop: in-memory lookups
+    are faster than switching threads), so endpoints can `await` any backend.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    @property
+    def version(self) -> int:
+        return self.store.version
+
+    async def close(self):
+        close = getattr(self.store, "close", None)
+        if close is not None:
+            close()  # e.g. unmap a shared memory segment
+
+    async def count(self) -> int:
+        return len(self.store)
+
+    async def get(self, item_id):
+        return self.store.get(item_id)
+
+    async def find_by_name(self, name):
+        return self.store.find_by_name(name)
+
+    async def search(self, query, substring=False, limit=10):
+        return self.store.search(query, substring, limit)
+
+    async def by_price(self, min_price=None, max_price=None, start=0, limit=None):
+        return self.store.by_price(min_price, max_price, start, limit)
+
+    async def count_by_price(self, min_price=None, max_price=None):
+        return self.store.count_by_price(min_price, max_price)
+
+    async def in_stock(self, flag=True):
+        return self.store.in_stock(flag)
+
+    async def page(self, start=0, size=10):
+        return self.store.page(start, size)
+
+    async def page_after(self, after_id=None, limit=10):
+        return self.store.page_after(after_id, limit)
+
+    # Lazy listings: plain iterators, consumed on the event loop chunk by chunk
+    def iter_by_name(self, name):
+        return self.store.iter_by_name(name)
+
+    def iter_by_price(self, min_price=None, max_price=None):
+        return self.store.iter_by_price(min_price, max_price)
+
+    def iter_in_stock(self, flag=True):
+        return self.store.iter_in_stock(flag)
+
+    def iter_page(self, start=0, size=10):
+        return self.store.iter_page(start, size)
+
+    async def insert(self, item):
+        return self.store.insert(item)
+
+    async def insert_many(self, items):
+        # All or nothing, like the single transaction of the SQLite engine
+        saved = []
+        try:
+            for item in items:
+                saved.append(self.store.insert(item))
+        except Exception:
+            for item in saved:
+                self.store.delete(item["id"])
+            raise
+        return saved
+
+    async def update(self, item_id, **changes):
+        return self.store.update(item_id, **changes)
+
+    async def delete(self, item_id):
+        return self.store.delete(item_id)
+
+
+def open_store(
+    seed=(),
+    engine: str = "memory",
+    db_path: str = "catalog.db",
+    pool_size: int = 4,
+    shm_name: str = "catalog"
+):
+    """
+    Catalog backend by name, always with the async interface:
+    - "memory"   → AsyncStore(ItemStore)
+    - "columnar" → AsyncStore(ColumnarStore)      (needs numpy)
+    - "sqlite"   → SQLiteItemStore                (persistent, shared by workers)
+    - "shm"      → AsyncStore(SharedMemoryStore)  (one copy in RAM, shared by workers)
+    """
+    if engine == "memory":
+        return AsyncStore(ItemStore(seed))
+    if engine == "columnar":
+        from shared.columnar import ColumnarStore
+        return AsyncStore(ColumnarStore(seed))
+    if engine == "sqlite":
+        from shared.sqlite_store import SQLiteItemStore
+        return SQLiteItemStore(db_path, seed=seed, pool_size=pool_size)
+    if engine == "shm":
+        from shared.shm_store import SharedMemoryStore
+        return AsyncStore(SharedMemoryStore(shm_name, seed=seed))
+    raise ValueError(f"Unknown catalog engine: {engine!r}")
+
+
+# ---------------------------
+# Opaque pagination cursors
+# ---------------------------
+def encode_cursor(item_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{item_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Raises ValueError for cursors that were not produced by encode_cursor."""
+    try:
+        prefix, _, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if prefix != "id":
+        raise ValueError("Malformed cursor")
+    return int(item_id)
@@ -0,0 +1,53 @@
+"""
+Opt-in NDJSON streaming for large listings.
+
+Instead of encoding the whole list into one JSON body, each item is written
+as one JSON line and sent in small chunks, so memory stays bounded and the
+first items reach the client right away. Pass a lazy source (the stores'
+`iter_*` methods, a generator): a list would be built in full first.
+
+    return ndjson_response(store.iter_in_stock(True))
+
+Clients opt in with `Accept: application/x-ndjson` or `?stream=true`.
+"""
+import json
+from collections.abc import AsyncIterable, Iterable
+from itertools import islice
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON = "application/x-ndjson"
+
+# Lines per chunk: one chunk per item would spend more time in send() than in encoding
+CHUNK_SIZE = 256
+
+
+def stream_requested(request: Request, stream: bool = False) -> bool:
+    """Dependency: True when the client asked for a streamed response."""
+    return stream or NDJSON in request.headers.get("accept", "")
+
+
+def ndjson_response(rows: Iterable[dict] | AsyncIterable[dict]) -> StreamingResponse:
+    return StreamingResponse(_ndjson_lines(rows), media_type=NDJSON)
+
+
+async def _ndjson_lines(rows: Iterable[dict] | AsyncIterable[dict]):
+    # Async generator: runs on the event loop, no thread hop per chunk.
+    # Rows are pulled one chunk at a time, so each chunk goes out as soon as
+    # its rows are produced.
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    if isinstance(rows, AsyncIterable):
+        chunk = []
+        async for row in rows:
+            chunk.append(dumps(row))
+            if len(chunk) == CHUNK_SIZE:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+        return
+
+    rows = iter(rows)
+    while chunk := [dumps(row) for row in islice(rows, CHUNK_SIZE)]:
+        yield "\n".join(chunk) + "\n"
@@ -0,0 +1,119 @@
+"""
+In-memory user store with an id index and one bitmap per role.
+
+Users are plain dicts ({"id": ..., "username": ..., "roles": [...]}).
+
+    - by id   → dict {id: user}          (O(1) lookup)
+    - by role → Bitmap of user ids       (O(1) "is X an admin?", ascending
+                                          iteration, and/or/not across roles)
+
+A user can have several roles (an admin is usually an editor too), so
+"editors who are not admins" is one bitmap subtraction instead of a scan.
+"""
+from collections.abc import Iterable
+
+from shared.bitmap import Bitmap
+
+
+class UserStore:
+    def __init__(self, roles: Iterable[str], users: Iterable[dict] = ()):
+        self.version = 0
+        self._by_id: dict[int, dict] = {}
+        self._by_role: dict[str, Bitmap] = {role: Bitmap() for role in roles}
+        for user in users:
+            self.insert(user)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def get(self, user_id: int) -> dict | None:
+        return self._by_id.get(user_id)
+
+    def has_role(self, user_id: int, role: str) -> bool:
+        return user_id in self._role(role)
+
+    def count(self, role: str) -> int:
+        return len(self._role(role))
+
+    def select(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> Bitmap:
+        """
+        Ids of the users having every role in `all_of`, at least one role in
+        `any_of` (when given) and none of the roles in `none_of`.
+        """
+        all_of, any_of, none_of = list(all_of), list(any_of), list(none_of)
+        if not all_of and not any_of:
+            raise ValueError("Select at least one role (all_of or any_of)")
+
+        selected = None
+        for role in all_of:
+            selected = self._role(role) if selected is None else selected & self._role(role)
+        if any_of:
+            union = self._role(any_of[0])
+            for role in any_of[1:]:
+                union = union | self._role(role)
+            selected = union if selected is None else selected & union
+        for role in none_of:
+            selected = selected - self._role(role)
+        return selected
+
+    def page(self, ids: Bitmap, after: int | None = None, limit: int = 100) -> tuple[list[dict], int | None]:
+        """
+        Keyset pagination over a bitmap: up to `limit` users with id > after.
+        Returns the page and the id to continue after (None on the last page).
+        """
+        page = []
+        for user_id in ids.iter_from(0 if after is None else after + 1):
+            if len(page) == limit:
+                return page, page[-1]["id"]
+            page.append(self._by_id[user_id])
+        return page, None
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def insert(self, user: dict) -> dict:
+        user_id = user["id"]
+        if user_id in self._by_id:
+            raise KeyError(f"User {user_id} already exists")
+        for role in user["roles"]:
+            self._role(role)  # unknown role → ValueError before anything is written
+        self.version += 1
+        self._by_id[user_id] = user
+        for role in user["roles"]:
+            self._by_role[role].add(user_id)
+        return user
+
+    def update(self, user_id: int, **changes) -> dict:
+        user = self._by_id[user_id]
+        if "id" in changes and changes["id"] != user_id:
+            raise ValueError("The id of a user cannot be changed")
+        for role in changes.get("roles", ()):
+            self._role(role)
+        self.version += 1
+        for role in user["roles"]:
+            self._by_role[role].discard(user_id)
+        user.update(changes)
+        for role in user["roles"]:
+            self._by_role[role].add(user_id)
+        return user
+
+    def delete(self, user_id: int) -> dict:
+        self.version += 1
+        user = self._by_id.pop(user_id)
+        for role in user["roles"]:
+            self._by_role[role].discard(user_id)
+        return user
+
+    def _role(self, role: str) -> Bitmap:
+        try:
+            return self._by_role[role]
+        except KeyError:
+            raise ValueError(f"Unknown role: {role!r}") from None
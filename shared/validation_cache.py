@@ -0,0 +1,87 @@
+"""
+Bounded LRU cache for Pydantic validation results.
+
+Some inputs repeat over and over (the same CDN image URLs in millions of
+requests). Validating them again re-parses the same string every time.
+A `ValidationCache` remembers the validated value for each raw input and
+hands back the same instance on the next identical input.
+
+Use it as a wrap validator, on a field or on a whole model:
+
+    url_cache = ValidationCache(maxsize=4096)
+    CachedHttpUrl = Annotated[HttpUrl, WrapValidator(url_cache.wrap)]
+
+    class Image(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
+        @model_validator(mode="wrap")
+        @classmethod
+        def reuse_validated(cls, data, handler):
+            return image_cache.wrap(data, handler)
+
+Cached instances are shared between requests: cache immutable values only
+(frozen models, HttpUrl, ...). A cache with maxsize=0 just calls the
+validator, but the wrap validator itself still costs a call per value:
+attach it only when the cache is on.
+"""
+from collections import OrderedDict
+
+
+class ValidationCache:
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def wrap(self, value, handler):
+        """Wrap-validator body: cached result for `value`, or run `handler`."""
+        if self.maxsize <= 0:
+            return handler(value)
+
+        key = _cache_key(value)
+        if key is None:
+            return handler(value)  # unhashable / already validated input
+
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        # Errors propagate as usual; only successful results are stored
+        self.misses += 1
+        validated = handler(value)
+        self._entries[key] = validated
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return validated
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.maxsize > 0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _cache_key(value):
+    # Raw JSON inputs only: strings, numbers, and flat objects of those
+    if isinstance(value, (str, int, float)):
+        return (type(value), value)
+    if isinstance(value, dict):
+        try:
+            key = (dict, frozenset(value.items()))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    return None
@@ -0,0 +1,188 @@
+"""
+Write-behind queue: accept a mutation now, write it to storage a bit later.
+
+    writes = WriteBehindQueue(apply_batch, maxsize=1000, batch_size=100)
+
+    return await enqueue(writes, payload, request)   # in the handler → 202 + ticket
+    writes.status(ticket)                             # queued / done / failed (+ result)
+
+The handler only validates and enqueues, so its latency no longer depends
+on the storage. One asyncio worker takes up to `batch_size` queued payloads
+at a time and passes them to `apply_batch(payloads) -> results` (one result,
+or Exception, per payload), so the store sees a few large writes instead of
+many small ones. Each ticket is settled from its own entry: `apply_batch`
+should catch errors per payload, since an exception out of it can't tell
+which writes were applied, and fails the whole batch.
+
+    - bounded queue: at most `maxsize` pending writes
+    - back-pressure: `submit` waits up to `put_timeout` for room, then raises
+      `WriteQueueFull` (→ 503 + Retry-After)
+    - shutdown: `close()` stops accepting writes and drains the queue
+"""
+import asyncio
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from shared.responses import PydanticJSONResponse
+
+QUEUED, DONE, FAILED = "queued", "done", "failed"
+
+
+class WriteQueueFull(Exception):
+    """The queue stayed full for `put_timeout` seconds (or is shutting down)."""
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        apply_batch: Callable[[list], Awaitable[list]],
+        maxsize: int = 1000,
+        batch_size: int = 100,
+        put_timeout: float = 0.1,
+        max_tickets: int = 10_000,
+    ):
+        self.apply_batch = apply_batch
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.max_tickets = max_tickets
+        self.accepted = 0
+        self.rejected = 0
+        self.applied = 0
+        self.failed = 0
+        self.batches = 0
+        self._queue: asyncio.Queue | None = None  # created on the running event loop
+        self._tickets: OrderedDict[str, dict] = OrderedDict()
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+
+    # ---------------------------
+    # Lifecycle (call from the app's lifespan)
+    # ---------------------------
+    async def start(self):
+        self._closing = False
+        self._queue = asyncio.Queue(self.maxsize)
+        self._worker = asyncio.create_task(self._drain())
+
+    async def close(self):
+        """Refuse new writes, apply every queued one, then stop the worker."""
+        self._closing = True
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    # ---------------------------
+    # Producer side
+    # ---------------------------
+    async def submit(self, payload) -> str:
+        """Enqueue one mutation and return its ticket id."""
+        if self._closing:
+            self.rejected += 1
+            raise WriteQueueFull("Shutting down, not accepting writes")
+        if self._worker is None:
+            await self.start()  # app run without its lifespan (e.g. a bare TestClient)
+
+        ticket = uuid.uuid4().hex
+        entry = (ticket, payload)
+        # Registered first: the worker may finish the write before put() returns
+        self._tickets[ticket] = {"ticket": ticket, "status": QUEUED}
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            # Back-pressure: wait a little for the worker to make room
+            try:
+                await asyncio.wait_for(self._queue.put(entry), self.put_timeout)
+            except asyncio.TimeoutError:
+                del self._tickets[ticket]
+                self.rejected += 1
+                raise WriteQueueFull(f"{self.maxsize} writes already pending") from None
+
+        self.accepted += 1
+        return ticket
+
+    def status(self, ticket: str) -> dict | None:
+        return self._tickets.get(ticket)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "applied": self.applied,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    # ---------------------------
+    # Worker side
+    # ---------------------------
+    async def _drain(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                results = list(await self.apply_batch([payload for _, payload in batch]))
+            except Exception as exc:  # no per-write entries: the whole batch failed
+                results = [exc] * len(batch)
+            if len(results) < len(batch):
+                missing = RuntimeError(f"apply_batch returned {len(results)} results for {len(batch)} writes")
+                results += [missing] * (len(batch) - len(results))
+
+            self.batches += 1
+            for (ticket, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    self.failed += 1
+                    self._finish(ticket, {"ticket": ticket, "status": FAILED, "error": str(result)})
+                else:
+                    self.applied += 1
+                    self._finish(ticket, {"ticket": ticket, "status": DONE, "result": result})
+                self._queue.task_done()
+
+    def _finish(self, ticket: str, state: dict):
+        self._tickets[ticket] = state
+        self._tickets.move_to_end(ticket)
+        # Keep the most recent finished tickets only (queued ones are never dropped)
+        while len(self._tickets) > self.max_tickets:
+            oldest, oldest_state = next(iter(self._tickets.items()))
+            if oldest_state["status"] == QUEUED:
+                break
+            del self._tickets[oldest]
+
+
+# ---------------------------
+# Handler side
+# ---------------------------
+class WriteTicket(BaseModel):
+    ticket: str
+    status: str
+
+
+async def enqueue(writes: WriteBehindQueue, payload, request: Request | None = None) -> Response:
+    """
+    Submit `payload`: 202 + ticket, or 503 + Retry-After when the queue is full.
+    `request` gives the prefix of a mounted app (main.py) for the Location header.
+    """
+    try:
+        ticket = await writes.submit(payload)
+    except WriteQueueFull as exc:
+        return JSONResponse({"error": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+    root_path = request.scope.get("root_path", "") if request is not None else ""
+    return PydanticJSONResponse(
+        WriteTicket(ticket=ticket, status=QUEUED),
+        status_code=202,
+        headers={"Location": f"{root_path}/writes/{ticket}"}
+    )